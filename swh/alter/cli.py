@@ -5,10 +5,26 @@
 
 from __future__ import annotations
 
+import contextlib
+import functools
+import itertools
 import logging
-import pathlib
+import logging.handlers
+import queue
+import re
 import sys
-from typing import TYPE_CHECKING, Callable, Dict, Iterable, Set, TextIO, Tuple, cast
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Set,
+    TextIO,
+    Tuple,
+    cast,
+)
 
 import click
 
@@ -16,22 +32,48 @@ from swh.core.cli import CONTEXT_SETTINGS
 from swh.core.cli import swh as swh_cli_group
 
 if TYPE_CHECKING:
+    from swh.journal.writer import JournalWriterInterface
     from swh.model.model import Origin
     from swh.model.swhids import ExtendedSWHID
+    from swh.objstorage.interface import ObjStorageInterface
+    from swh.search.interface import SearchInterface
+    from swh.storage.interface import ObjectDeletionInterface
 
     from .operations import Remover
     from .progressbar import ProgressBar, V
-    from .recovery_bundle import ObjectDecryptionKeyProvider, ShareDecryptionKeys
+    from .recovery_bundle import (
+        ObjectDecryptionKeyProvider,
+        SecretSharing,
+        ShareDecryptionKeys,
+    )
+
+
+# SWHIDs and origins are immutable, so the conversions from command line
+# arguments can be safely shared between repeated values.
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_extended_swhid(value: str) -> "ExtendedSWHID":
+    from swh.model.swhids import ExtendedSWHID
+
+    return ExtendedSWHID.from_string(value)
+
+
+@functools.lru_cache(maxsize=4096)
+def _origin_from_url(value: str) -> "Origin":
+    from swh.model.model import Origin
+
+    return Origin(url=value)
 
 
 class SWHIDType(click.ParamType):
     name = "swhid"
 
     def convert(self, value, param, ctx) -> "ExtendedSWHID":
-        from swh.model.swhids import ExtendedSWHID, ValidationError
+        from swh.model.swhids import ValidationError
 
         try:
-            return ExtendedSWHID.from_string(value)
+            return _parse_extended_swhid(value)
         except ValidationError:
             raise click.ClickException(f"Unable to parse “{value}” as a SWHID.")
 
@@ -40,17 +82,15 @@ class SwhidOrUrlParamType(click.ParamType):
     name = "swhid or origin URL"
 
     def convert(self, value, param, ctx):
-        from swh.model.exceptions import ValidationError
-        from swh.model.model import Origin
-        from swh.model.swhids import ExtendedSWHID
-
         if value.startswith("swh:1:"):
+            from swh.model.exceptions import ValidationError
+
             try:
-                return ExtendedSWHID.from_string(value)
+                return _parse_extended_swhid(value)
             except ValidationError:
                 self.fail(f"expected extended SWHID, got {value!r}", param, ctx)
         else:
-            return Origin(url=value)
+            return _origin_from_url(value)
 
 
 class ClickLoggingHandler(logging.Handler):
@@ -58,12 +98,66 @@ class ClickLoggingHandler(logging.Handler):
     attribute."""
 
     def emit(self, record):
-        if hasattr(record, "style"):
-            click.secho(self.format(record), **record.style)
+        style = getattr(record, "style", None)
+        if style is not None:
+            click.secho(self.format(record), **style)
         else:
             click.echo(self.format(record))
 
 
+# Move back to the start of the line and erase it
+_CLEAR_LINE = "\r\033[K"
+
+
+class BufferingClickLoggingHandler(logging.handlers.MemoryHandler):
+    """Handler displaying logs like :py:class:`ClickLoggingHandler`, but
+    buffering records to write consecutive ones going to the same stream with a
+    single ``click.echo()`` call.
+
+    Buffered records are written when the buffer is full, when a record of
+    level ERROR or above is handled, or when :py:meth:`flush` is called.
+
+    Records can be written while a progress bar is displayed on the terminal.
+    The line of the bar is then cleared first, and the bar gets drawn again
+    below the records on its next update."""
+
+    def __init__(self, capacity: int = 1024):
+        super().__init__(capacity, flushLevel=logging.ERROR)
+
+    def _styled(self, record: logging.LogRecord) -> str:
+        message = self.format(record)
+        style = {k: v for k, v in getattr(record, "style", {}).items() if k != "err"}
+        return click.style(message, **style) if style else message
+
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            if self.buffer and sys.stderr.isatty():
+                # Progress bars are drawn on stderr, without a final newline
+                click.echo(_CLEAR_LINE, nl=False, err=True)
+            for err, records in itertools.groupby(
+                self.buffer,
+                key=lambda record: getattr(record, "style", {}).get("err", False),
+            ):
+                click.echo("\n".join(self._styled(r) for r in records), err=err)
+            self.buffer.clear()
+        finally:
+            self.release()
+
+
+class _FlushingQueueListener(logging.handlers.QueueListener):
+    """A QueueListener flushing its handlers each time the queue is drained."""
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        q = cast("queue.SimpleQueue[logging.LogRecord]", self.queue)
+        try:
+            return q.get_nowait()
+        except queue.Empty:
+            for handler in self.handlers:
+                handler.flush()
+            return q.get(block)
+
+
 def progressbar(
     iterable: Iterable[V] | None = None,
     length: int | None = None,
@@ -73,6 +167,8 @@ def progressbar(
     show_percent: bool | None = None,
     item_show_func: Callable[[V | None], str | None] | None = None,
 ) -> ProgressBar[V]:
+    from .progressbar import ThrottledProgressBar
+
     bar = click.progressbar(
         iterable=iterable,
         length=length,
@@ -88,7 +184,60 @@ def progressbar(
     # `ProgressBar[int]`. But in that case, iterable is not
     # given, so V is not bound and it is safe to assume
     # that V = int.
-    return cast("ProgressBar[V]", bar)
+    # Redrawing is throttled as updates typically happen once per object.
+    return ThrottledProgressBar(cast("ProgressBar[V]", bar))
+
+
+CLI_LOGGER_NAMES = ("swh.alter.operations", "swh.alter.recovery_bundle")
+
+
+@contextlib.contextmanager
+def queued_logging() -> Iterator[None]:
+    """Hand over records of the loggers configured by :py:func:`alter_cli_group`
+    to a background thread while in the context.
+
+    Writing to the terminal then happens outside of the calling thread, so
+    a slow output does not hold up removal operations. All pending records
+    are written when leaving the context, so any direct output afterwards
+    keeps appearing in order.
+
+    The context must not cover any operation prompting the user (e.g. for
+    decryption keys), as pending records could be written after the prompt.
+    """
+    listeners = []
+    saved_handlers = []
+    for logger in (logging.getLogger(name) for name in CLI_LOGGER_NAMES):
+        if logger.propagate or not logger.handlers:
+            # Not configured for the command line
+            continue
+        # Records reaching the listener are written in batches
+        listener_handlers: List[logging.Handler] = []
+        for handler in logger.handlers:
+            if isinstance(handler, ClickLoggingHandler):
+                buffering_handler = BufferingClickLoggingHandler()
+                buffering_handler.setLevel(handler.level)
+                buffering_handler.setFormatter(handler.formatter)
+                listener_handlers.append(buffering_handler)
+            else:
+                listener_handlers.append(handler)
+        q: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+        listeners.append(
+            _FlushingQueueListener(q, *listener_handlers, respect_handler_level=True)
+        )
+        saved_handlers.append((logger, logger.handlers))
+        logger.handlers = [logging.handlers.QueueHandler(q)]
+    for listener in listeners:
+        listener.start()
+    try:
+        yield
+    finally:
+        for logger, handlers in saved_handlers:
+            logger.handlers = handlers
+        for listener in listeners:
+            listener.stop()
+            for handler in listener.handlers:
+                if isinstance(handler, BufferingClickLoggingHandler):
+                    handler.close()
 
 
 @swh_cli_group.group(name="alter", context_settings=CONTEXT_SETTINGS)
@@ -171,9 +320,6 @@ def alter_cli_group(ctx):
     """  # noqa: B950
     from swh.core import config
 
-    from .operations import logger as operations_logger
-    from .recovery_bundle import logger as recovery_bundle_logger
-
     try:
         conf = config.load_from_envvar()
     except AssertionError as ex:
@@ -181,7 +327,10 @@ def alter_cli_group(ctx):
     ctx.ensure_object(dict)
     ctx.obj["config"] = conf
 
-    for logger in (operations_logger, recovery_bundle_logger):
+    # Loggers are retrieved by name so that `.operations` and `.recovery_bundle`
+    # (and their heavy dependencies) only get imported by the commands
+    # actually using them.
+    for logger in (logging.getLogger(name) for name in CLI_LOGGER_NAMES):
         if not logger.propagate:
             # Avoid configuring the logger twice
             continue
@@ -192,8 +341,6 @@ def alter_cli_group(ctx):
 
 
 def read_swhids(file: TextIO) -> Set["ExtendedSWHID"]:
-    import re
-
     from swh.model.swhids import ExtendedSWHID
 
     filter_re = re.compile(r"^(#|$)")
@@ -204,24 +351,67 @@ def read_swhids(file: TextIO) -> Set["ExtendedSWHID"]:
     }
 
 
+@functools.lru_cache(maxsize=8)
+def _secret_sharing_from_json(secret_sharing_json: str) -> "SecretSharing":
+    import json
+
+    from .recovery_bundle import SecretSharing
+
+    return SecretSharing.from_dict(json.loads(secret_sharing_json))
+
+
+def get_secret_sharing(ctx: click.Context) -> "SecretSharing":
+    """Returns the secret sharing scheme from the ``recovery_bundles`` configuration.
+
+    Parsed schemes are kept for identical configurations, keyed by their
+    canonical JSON serialization.
+
+    Raises:
+        click.ClickException if the configuration is invalid
+    """
+    import json
+
+    from .recovery_bundle import SecretSharing
+
+    d = ctx.obj["config"].get("recovery_bundles", {}).get("secret_sharing")
+    try:
+        try:
+            secret_sharing_json = json.dumps(d, sort_keys=True)
+        except TypeError:
+            # Not serializable as JSON, so not cacheable
+            return SecretSharing.from_dict(d)
+        return _secret_sharing_from_json(secret_sharing_json)
+    except ValueError as e:
+        raise click.ClickException(f"Wrong secret sharing configuration: {e.args[0]}")
+
+
+def _check_recovery_bundle_can_be_created(recovery_bundle: str) -> None:
+    """Make sure that a new file can be created at the given path.
+
+    Raises:
+        click.ClickException if the file already exists or cannot be created
+    """
+    import os
+
+    try:
+        fd = os.open(recovery_bundle, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+    except FileExistsError:
+        raise click.ClickException(f"File “{recovery_bundle}” already exists")
+    except PermissionError:
+        raise click.ClickException(f"Permission denied: “{recovery_bundle}”")
+    os.close(fd)
+    os.unlink(recovery_bundle)
+
+
 def get_remover(
     ctx: click.Context,
     dry_run: bool = False,
     require_masking_admin: bool = False,
     ignore_backends: Iterable[str] | None = None,
 ) -> "Remover":
-    from psycopg import OperationalError, ProgrammingError
-
-    from swh.core.api import RemoteException
-    from swh.graph.http_client import GraphAPIError, RemoteGraphClient
-    from swh.journal.writer import get_journal_writer
-    from swh.journal.writer.kafka import KafkaJournalWriter
-    from swh.objstorage.factory import get_objstorage
-    from swh.objstorage.interface import ObjStorageInterface
-    from swh.search import get_search
-    from swh.search.interface import SearchInterface
+    # Backend modules pull large dependencies (database drivers, Kafka and
+    # Elasticsearch clients…): only import them when they are configured.
     from swh.storage import get_storage
-    from swh.storage.interface import ObjectDeletionInterface
 
     from .operations import Remover
 
@@ -235,6 +425,8 @@ def get_remover(
         else:
             raise click.ClickException("Configuration does not define `graph`")
     else:
+        from swh.graph.http_client import GraphAPIError, RemoteGraphClient
+
         try:
             graph_client = RemoteGraphClient(**conf["graph"])
         except GraphAPIError as e:
@@ -277,12 +469,17 @@ def get_remover(
     )
 
     removal_searches = {}
-    for name, d in conf.get("removal_searches", {}).items():
-        removal_searches[name] = get_search(**d)
-        try:
-            removal_searches[name].check()
-        except RemoteException as e:
-            raise click.ClickException(f"Search “{name}” is unreachable: {e}")
+    if conf.get("removal_searches"):
+        from swh.core.api import RemoteException
+        from swh.search import get_search
+
+        for name, d in conf["removal_searches"].items():
+            removal_search = get_search(**d)
+            try:
+                removal_search.check()
+            except RemoteException as e:
+                raise click.ClickException(f"Search “{name}” is unreachable: {e}")
+            removal_searches[name] = removal_search
 
     removal_storages = {}
     for name, d in conf.get("removal_storages", {}).items():
@@ -293,22 +490,31 @@ def get_remover(
         removal_storages[name] = removal_storage
 
     removal_objstorages = {}
-    for name, d in conf.get("removal_objstorages", {}).items():
-        removal_objstorages[name] = get_objstorage(**d)
+    if conf.get("removal_objstorages"):
+        from swh.objstorage.factory import get_objstorage
+
+        for name, d in conf["removal_objstorages"].items():
+            removal_objstorages[name] = get_objstorage(**d)
 
     removal_journals = {}
-    for name, d in conf.get("removal_journals", {}).items():
-        journal_writer = get_journal_writer(**d)
-        assert isinstance(
-            journal_writer, KafkaJournalWriter
-        ), "journal writer is not kafka-based"
-        removal_journals[name] = journal_writer
+    if conf.get("removal_journals"):
+        from swh.journal.writer import get_journal_writer
+        from swh.journal.writer.kafka import KafkaJournalWriter
+
+        for name, d in conf["removal_journals"].items():
+            journal_writer = get_journal_writer(**d)
+            assert isinstance(
+                journal_writer, KafkaJournalWriter
+            ), "journal writer is not kafka-based"
+            removal_journals[name] = journal_writer
 
     known_missing = set(ctx.params.get("known_missing_swhids", set()))
     if known_missing_file := ctx.params.get("known_missing_file"):
         known_missing.update(read_swhids(known_missing_file))
 
     if require_masking_admin:
+        from psycopg import OperationalError, ProgrammingError
+
         from swh.storage.proxies.masking.db import MaskingAdmin
 
         if "masking_admin" not in conf or "db" not in conf["masking_admin"]:
@@ -324,10 +530,10 @@ def get_remover(
         storage=storage,
         graph_client=graph_client,
         restoration_storage=restoration_storage,
-        removal_searches=cast(Dict[str, SearchInterface], removal_searches),
-        removal_storages=cast(Dict[str, ObjectDeletionInterface], removal_storages),
-        removal_objstorages=cast(Dict[str, ObjStorageInterface], removal_objstorages),
-        removal_journals=cast(Dict[str, KafkaJournalWriter], removal_journals),
+        removal_searches=cast("Dict[str, SearchInterface]", removal_searches),
+        removal_storages=cast("Dict[str, ObjectDeletionInterface]", removal_storages),
+        removal_objstorages=cast("Dict[str, ObjStorageInterface]", removal_objstorages),
+        removal_journals=cast("Dict[str, KafkaJournalWriter]", removal_journals),
         masking_admin=masking_admin,
         known_missing=known_missing,
         progressbar=progressbar,
@@ -441,30 +647,18 @@ def remove(
 ) -> None:
     """Remove the given SWHIDs or URLs from the archive."""
 
-    from swh.journal.writer import JournalWriterInterface, get_journal_writer
     from swh.model.model import Origin
 
     from .inventory import RootsNotFound, StuckInventoryException
-    from .notifications import RemovalNotification
     from .operations import RemoverError
-    from .recovery_bundle import ContentDataNotFound, SecretSharing
-
-    try:
-        secret_sharing = SecretSharing.from_dict(
-            ctx.obj["config"]["recovery_bundles"]["secret_sharing"]
-        )
-    except ValueError as e:
-        raise click.ClickException(f"Wrong secret sharing configuration: {e.args[0]}")
+    from .recovery_bundle import ContentDataNotFound
 
+    # The secret sharing configuration is only needed to create the recovery
+    # bundle, but we want to report errors before running the inventory.
+    secret_sharing: SecretSharing | None = None
     if dry_run != "stop-before-recovery-bundle":
-        try:
-            p = pathlib.Path(recovery_bundle)
-            p.touch(exist_ok=False)
-            p.unlink()
-        except FileExistsError:
-            raise click.ClickException(f"File “{recovery_bundle}” already exists")
-        except PermissionError:
-            raise click.ClickException(f"Permission denied: “{recovery_bundle}”")
+        secret_sharing = get_secret_sharing(ctx)
+        _check_recovery_bundle_can_be_created(recovery_bundle)
 
     remover = get_remover(ctx, dry_run, ignore_backends=ignore_backends)
 
@@ -472,16 +666,19 @@ def remove(
 
     journal_writer: JournalWriterInterface | None = None
     if "journal_writer" in ctx.obj["config"]:
+        from swh.journal.writer import get_journal_writer
+
         cfg = ctx.obj["config"]["journal_writer"]
         journal_writer = get_journal_writer(**cfg)
 
     try:
-        removable = remover.get_removable(
-            swhids,
-            output_inventory_subgraph=output_inventory_subgraph,
-            output_removable_subgraph=output_removable_subgraph,
-            output_pruned_removable_subgraph=output_pruned_removable_subgraph,
-        )
+        with queued_logging():
+            removable = remover.get_removable(
+                swhids,
+                output_inventory_subgraph=output_inventory_subgraph,
+                output_removable_subgraph=output_removable_subgraph,
+                output_pruned_removable_subgraph=output_pruned_removable_subgraph,
+            )
         removable.print_plan()
         if dry_run == "stop-before-recovery-bundle":
             click.echo("Stopping before creating the recovery bundle as requested.")
@@ -497,16 +694,18 @@ def remove(
                 abort=True,
             )
 
-        decryption_key = remover.create_recovery_bundle(
-            secret_sharing=secret_sharing,
-            requested=list(requested),
-            removable=removable,
-            recovery_bundle_path=recovery_bundle,
-            removal_identifier=identifier,
-            reason=reason,
-            expire=expire.astimezone() if expire else None,
-            allow_empty_content_objects=allow_empty_content_objects,
-        )
+        assert secret_sharing is not None
+        with queued_logging():
+            decryption_key = remover.create_recovery_bundle(
+                secret_sharing=secret_sharing,
+                requested=list(requested),
+                removable=removable,
+                recovery_bundle_path=recovery_bundle,
+                removal_identifier=identifier,
+                reason=reason,
+                expire=expire.astimezone() if expire else None,
+                allow_empty_content_objects=allow_empty_content_objects,
+            )
         click.secho(f"Recovery bundle decryption key: {decryption_key}", fg="blue")
     except RemoverError as e:
         click.secho(e.args[0], err=True, fg="red")
@@ -551,7 +750,8 @@ def remove(
         ctx.exit(0)
 
     try:
-        remover.remove()
+        with queued_logging():
+            remover.remove()
     except Exception as e:
         click.secho(str(e), err=True, fg="red", bold=True)
         click.secho("Rolling back…", fg="cyan")
@@ -559,6 +759,8 @@ def remove(
         ctx.exit(1)
     else:
         if journal_writer is not None:
+            from .notifications import RemovalNotification
+
             click.secho("Sending removal notification…", fg="cyan")
             notif = RemovalNotification(
                 removal_identifier=identifier,
@@ -654,8 +856,7 @@ def list_candidates(
     removable_swhids.extend(
         get_raw_extrinsic_metadata(storage, removable_swhids, progressbar=progressbar)
     )
-    for swhid in removable_swhids:
-        click.echo(swhid)
+    _echo_lines(removable_swhids)
 
 
 @alter_cli_group.command("run-mirror-notification-watcher")
@@ -765,6 +966,16 @@ def recovery_bundle_cli_group(ctx):
     return ctx
 
 
+def _echo_lines(lines: Iterable[object]) -> None:
+    """Write the given lines to the standard output.
+
+    Bundles can list millions of objects: lines are streamed to a buffered
+    writer instead of going through one ``click.echo()`` call each, or
+    building the whole output in memory."""
+    sys.stdout.writelines(f"{line}\n" for line in lines)
+    sys.stdout.flush()
+
+
 @recovery_bundle_cli_group.command(name="info")
 @click.option(
     "--dump-manifest",
@@ -809,89 +1020,137 @@ def info(ctx, recovery_bundle, dump_manifest, show_encrypted_secrets) -> None:
         click.echo(f"Expire: {bundle.expire}")
     if bundle.version >= 3:
         click.echo("Removal requested for:")
-        for x in bundle.requested:
-            click.echo(f"- {x.url if isinstance(x, Origin) else x}")
+        _echo_lines(
+            f"- {x.url if isinstance(x, Origin) else x}" for x in bundle.requested
+        )
     click.echo("SWHID of the objects present in the bundle:")
-    for swhid in bundle.swhids:
-        click.echo(f"- {swhid}")
+    _echo_lines(f"- {swhid}" for swhid in bundle.swhids)
     if bundle.version >= 3 and len(bundle.referencing):
         click.echo("SWHID referenced by objects in this bundle:")
-        for swhid in bundle.referencing:
-            click.echo(f"- {swhid}")
+        _echo_lines(f"- {swhid}" for swhid in bundle.referencing)
     click.echo("Secret share holders:")
-    for share_id in sorted(bundle.share_ids):
-        click.echo(f"- {share_id}")
-        if show_encrypted_secrets:
+    if show_encrypted_secrets:
+        for share_id in bundle.sorted_share_ids:
+            click.echo(f"- {share_id}")
             click.echo(bundle.encrypted_secret(share_id))
+    else:
+        _echo_lines(f"- {share_id}" for share_id in bundle.sorted_share_ids)
+
+
+# Share identifiers and mnemonic words are styled in loops: compute the
+# escape sequences once. The results are identical to `click.style()`.
+_SHARE_ID_STYLE = click.style("", fg="magenta", bold=True, reset=False)
+_MNEMONIC_WORD_STYLES = (
+    click.style("", fg="blue", bold=False, reset=False),
+    click.style("", fg="blue", bold=True, reset=False),
+)
+_STYLE_RESET = "\x1b[0m"
+
+
+def _style_share_id(share_id: str) -> str:
+    return f"{_SHARE_ID_STYLE}{share_id}{_STYLE_RESET}"
+
+
+# Static messages of the YubiKey share provider
+_STYLED_ENTER_KEY = click.style("Enter", fg="green", bold=True)
+_YUBIKEY_LISTING_FAILED_MESSAGE = "💥 " + click.style(
+    "age-plugin-yubikey failed to list connected YubiKeys.", bold=True, fg="red"
+)
+_NOT_ENOUGH_SHARES_MESSAGE = "💥 " + click.style(
+    "Unable to decrypt enough shared secrets to recover "
+    "the object decryption key. Aborting.",
+    bold=True,
+    fg="red",
+)
+
+
+YUBIKEY_IDENTITIES_META_KEY = "swh.alter.yubikey_identities"
+
+
+def _list_yubikey_identities(refresh: bool = False) -> List[Tuple[str, str]]:
+    """Returns the identities of the connected YubiKeys.
+
+    Listing them requires to spawn ``age-plugin-yubikey``, so the result is kept
+    for the rest of the command invocation (e.g. for every bundle during a
+    rollover) unless ``refresh`` is set, typically after the user has been asked
+    to insert other YubiKeys."""
+    from .recovery_bundle import list_yubikey_identities
+
+    ctx = click.get_current_context(silent=True)
+    if ctx is None:
+        return list_yubikey_identities()
+    if refresh or YUBIKEY_IDENTITIES_META_KEY not in ctx.meta:
+        ctx.meta[YUBIKEY_IDENTITIES_META_KEY] = list_yubikey_identities()
+    return ctx.meta[YUBIKEY_IDENTITIES_META_KEY]
 
 
 def _share_decryption_keys_provider(share_ids: Set[str]) -> ShareDecryptionKeys:
     import subprocess
     import sys
 
-    from .recovery_bundle import list_yubikey_identities
-
+    # Only shares requiring a YubiKey can be handled here
+    yubikey_share_ids = {
+        share_id for share_id in share_ids if share_id.startswith("YubiKey")
+    }
+    # Sorted once, then filtered as shares get decrypted
+    sorted_yubikey_share_ids = sorted(yubikey_share_ids)
+    refresh = False
+    prompted_share_ids: Set[str] = set()
+    prompt = ""
     for attempt in range(1, 10):
-        if not any(share_id.startswith("YubiKey") for share_id in share_ids):
+        if not yubikey_share_ids:
             # No shares require a YubiKey, so there is nothing we can do here
             break
         try:
-            for share_id, secret_key in list_yubikey_identities():
-                if share_id not in share_ids:
+            for share_id, secret_key in _list_yubikey_identities(refresh=refresh):
+                if share_id not in yubikey_share_ids:
                     continue
-                share_ids.remove(share_id)
-                click.echo(
-                    "🔧 Decrypting share using "
-                    f"{click.style(share_id, fg='magenta', bold=True)}…"
-                )
+                yubikey_share_ids.remove(share_id)
+                click.echo(f"🔧 Decrypting share using {_style_share_id(share_id)}…")
                 click.echo("💭 You might need to tap the right YubiKey when it blinks.")
                 yield share_id, secret_key
                 click.echo()
         except subprocess.CalledProcessError as ex:
             if "age-plugin-yubikey" not in ex.cmd[0]:
                 raise
-            message = click.style(
-                "age-plugin-yubikey failed to list connected YubiKeys.",
-                bold=True,
-                fg="red",
-            )
-            click.echo(f"💥 {message}")
+            click.echo(_YUBIKEY_LISTING_FAILED_MESSAGE)
             click.echo("💭 Please disconnect all YubiKeys and retry.")
             sys.exit(1)
-        if share_ids:
-            yubikey_ids = list(sorted(share_ids))
-            if len(yubikey_ids) > 1:
-                yubikeys = ", ".join(
-                    click.style(share_id, fg="magenta", bold=True)
-                    for share_id in yubikey_ids[:-1]
-                )
-                yubikeys += " or " + click.style(
-                    yubikey_ids[-1], fg="magenta", bold=True
+        if yubikey_share_ids:
+            # The prompt only changes when some shares have been decrypted
+            if prompted_share_ids != yubikey_share_ids:
+                prompted_share_ids = set(yubikey_share_ids)
+                yubikey_ids = [
+                    share_id
+                    for share_id in sorted_yubikey_share_ids
+                    if share_id in yubikey_share_ids
+                ]
+                if len(yubikey_ids) > 1:
+                    yubikeys = ", ".join(
+                        _style_share_id(share_id) for share_id in yubikey_ids[:-1]
+                    )
+                    yubikeys += " or " + _style_share_id(yubikey_ids[-1])
+                else:
+                    yubikeys = _style_share_id(yubikey_ids[0])
+                prompt = (
+                    f"🔐 Please insert {yubikeys} and press " f"{_STYLED_ENTER_KEY}…"
                 )
-            else:
-                yubikeys = click.style(yubikey_ids[0], fg="magenta", bold=True)
             click.prompt(
-                f"🔐 Please insert {yubikeys} and press "
-                f"{click.style('Enter', fg='green', bold=True)}…",
+                prompt,
                 default="Ok",
                 show_default=False,
                 hide_input=True,
                 prompt_suffix="",
             )
-    message = click.style(
-        "Unable to decrypt enough shared secrets to recover "
-        "the object decryption key. Aborting.",
-        bold=True,
-        fg="red",
-    )
-    click.echo(f"💥 {message}")
+            refresh = True
+    click.echo(_NOT_ENOUGH_SHARES_MESSAGE)
     sys.exit(1)
 
 
 def _print_decrypted_mnemonic(mnemonic: str, share_id: str | None = None) -> None:
     fmt_from = ""
     if share_id:
-        fmt_from = f" from {click.style(share_id, fg='magenta', bold=True)}"
+        fmt_from = f" from {_style_share_id(share_id)}"
     click.echo(f"🔑 Recovered shared secret{fmt_from}:")
     # Quoting from SLIP-0039: This construction yields a beneficial
     # property where the random identifier and the iteration exponent
@@ -904,28 +1163,107 @@ def _print_decrypted_mnemonic(mnemonic: str, share_id: str | None = None) -> Non
     words = mnemonic.split()
     click.echo(
         " ".join(
-            click.style(word, fg="blue", bold=index < 3)
+            f"{_MNEMONIC_WORD_STYLES[index < 3]}{word}{_STYLE_RESET}"
             for index, word in enumerate(words)
         )
     )
 
 
+def _is_plain_age_identity_file(identity_file: str) -> bool:
+    """Tell if ``identity_file`` only holds unencrypted ``AGE-SECRET-KEY``
+    identities, i.e. whether ``rage`` can use it without any user interaction."""
+    try:
+        with open(identity_file, "r") as f:
+            lines = [line.strip() for line in f]
+    except (OSError, UnicodeDecodeError):
+        return False
+    identities = [line for line in lines if line and not line.startswith("#")]
+    return len(identities) > 0 and all(
+        line.startswith("AGE-SECRET-KEY-") for line in identities
+    )
+
+
 def _recover_mnemonics_from_identity_files(
     manifest, share_ids, identity_files, show_decrypted_mnemonics
 ):
+    from concurrent.futures import Future, ThreadPoolExecutor
+
     from .recovery_bundle import WrongDecryptionKey, age_decrypt_from_identity
 
     # As we can’t know which identity file corresponds to which encrypted shared
     # secret, we have to try them all and see which one we can actually decrypt.
     recovered = {}
-    for identity_file in identity_files:
+
+    def record(share_id: str, mnemonic: bytes) -> None:
+        recovered[share_id] = mnemonic.decode("us-ascii")
+        if show_decrypted_mnemonics:
+            _print_decrypted_mnemonic(recovered[share_id], share_id)
+
+    # Each attempt runs `rage` in a subprocess. Plain identity files need no
+    # user interaction, so they can be tried concurrently. Passphrase-protected
+    # identities or plugins (e.g. `age-plugin-yubikey` asking for a PIN and a
+    # touch) would prompt the user, so these are tried one at a time.
+    plain_identity_files = [
+        identity_file
+        for identity_file in identity_files
+        if _is_plain_age_identity_file(identity_file)
+    ]
+    interactive_identity_files = [
+        identity_file
+        for identity_file in identity_files
+        if identity_file not in plain_identity_files
+    ]
+    tasks = [
+        (identity_file, share_id)
+        for identity_file in plain_identity_files
+        for share_id in share_ids
+    ]
+    if tasks:
+        # Once a share has been decrypted, attempts for the same share that
+        # have not started yet are cancelled.
+        futures_by_share_id: Dict[str, List[Future]] = {}
+
+        def cancel_other_attempts(share_id: str, future: Future) -> None:
+            if not future.cancelled() and future.exception() is None:
+                for other_future in futures_by_share_id.get(share_id, []):
+                    other_future.cancel()
+
+        executor = ThreadPoolExecutor(max_workers=min(16, len(tasks)))
+        try:
+            futures = []
+            for identity_file, share_id in tasks:
+                future = executor.submit(
+                    age_decrypt_from_identity,
+                    identity_file,
+                    manifest.decryption_key_shares[share_id],
+                )
+                futures_by_share_id.setdefault(share_id, []).append(future)
+                future.add_done_callback(
+                    functools.partial(cancel_other_attempts, share_id)
+                )
+                futures.append(future)
+            # Results are collected in submission order to keep the output stable
+            for (_, share_id), future in zip(tasks, futures):
+                if share_id in recovered or future.cancelled():
+                    continue
+                try:
+                    record(share_id, future.result())
+                except WrongDecryptionKey:
+                    pass
+        finally:
+            # On error, do not start the attempts still waiting in the queue
+            executor.shutdown(cancel_futures=True)
+    for identity_file in interactive_identity_files:
         for share_id in share_ids:
+            if share_id in recovered:
+                continue
             try:
-                recovered[share_id] = age_decrypt_from_identity(
-                    identity_file, manifest.decryption_key_shares[share_id]
-                ).decode("us-ascii")
-                if show_decrypted_mnemonics:
-                    _print_decrypted_mnemonic(recovered[share_id], share_id)
+                record(
+                    share_id,
+                    age_decrypt_from_identity(
+                        identity_file, manifest.decryption_key_shares[share_id]
+                    ),
+                )
             except WrongDecryptionKey:
                 pass
     return recovered
@@ -934,8 +1272,6 @@ def _recover_mnemonics_from_identity_files(
 def prompting_object_decryption_key_provider(
     manifest, known_mnemonics=None, identity_files=None, show_decrypted_mnemonics=False
 ) -> str:
-    import functools
-
     from .recovery_bundle import recover_object_decryption_key_from_encrypted_shares
 
     decrypted_mnemonic_processor = None
@@ -950,14 +1286,12 @@ def prompting_object_decryption_key_provider(
         )
         share_ids.difference_update(recovered.keys())
         known_mnemonics.extend(recovered.values())
-    yubikey_share_ids = set(
+    yubikey_share_ids = {
         share_id for share_id in share_ids if share_id.startswith("YubiKey")
-    )
+    }
     missing_ids = share_ids - yubikey_share_ids
     if missing_ids:
-        fmt_ids = ", ".join(
-            click.style(share_id, fg="magenta", bold=True) for share_id in missing_ids
-        )
+        fmt_ids = ", ".join(_style_share_id(share_id) for share_id in missing_ids)
         message = click.style(
             "The following secret shares will not be decrypted:", fg="yellow"
         )
@@ -972,8 +1306,6 @@ def prompting_object_decryption_key_provider(
 
 
 def get_object_decryption_key_provider(ctx) -> ObjectDecryptionKeyProvider:
-    import functools
-
     secrets = ctx.params.get("secret")
     identity_files = ctx.params.get("identity")
     object_decryption_key_provider: ObjectDecryptionKeyProvider = functools.partial(
@@ -1066,7 +1398,7 @@ def extract_content(
     secret_key_provider = get_object_decryption_key_provider(ctx)
     bundle = RecoveryBundle(recovery_bundle, secret_key_provider)
 
-    if swhid not in bundle.swhids:
+    if swhid not in bundle.swhids_set:
         click.secho(
             f"“{swhid}” is not in the recovery bundle", err=True, fg="red", bold=True
         )
@@ -1137,8 +1469,7 @@ def restore(
                 fg="yellow",
                 bold=True,
             )
-            for swhid in missing:
-                click.secho(f"- {swhid}", fg="yellow")
+            click.secho("\n".join(f"- {swhid}" for swhid in missing), fg="yellow")
             click.confirm(
                 click.style(
                     "Proceed with restoration though it will create "
@@ -1184,14 +1515,13 @@ def resume_removal(
     decryption_key=None,
 ) -> None:
     """Resume a removal operation from a recovery bundle."""
-    from swh.journal.writer import JournalWriterInterface, get_journal_writer
-
-    from .notifications import RemovalNotification
     from .recovery_bundle import WrongDecryptionKey
 
     remover = get_remover(ctx)
     journal_writer: JournalWriterInterface | None = None
     if "journal_writer" in ctx.obj["config"]:
+        from swh.journal.writer import get_journal_writer
+
         cfg = ctx.obj["config"]["journal_writer"]
         journal_writer = get_journal_writer(**cfg)
 
@@ -1203,13 +1533,16 @@ def resume_removal(
         click.echo("Wrong decryption key for this bundle")
         ctx.exit(2)
     try:
-        remover.remove()
+        with queued_logging():
+            remover.remove()
     except Exception as e:
         click.secho(str(e), err=True, fg="red", bold=True)
         remover.restore_recovery_bundle()
         ctx.exit(1)
     else:
         if journal_writer is not None:
+            from .notifications import RemovalNotification
+
             notif = RemovalNotification(
                 removal_identifier=bundle.removal_identifier,
                 reason=bundle.reason or "",
@@ -1220,16 +1553,19 @@ def resume_removal(
             journal_writer.flush()
 
 
+# Matches a line starting with “[” or ending with “]”, with the newline
+# preceding it.
+_RAGE_REPORT_LINE_RE = re.compile(rb"\n(?:\[.*|.*\])(?=\n|\Z)")
+
+
 def _strip_rage_report(output):
     # rage prompts for report when it errors like this:
     #   [ Did rage not do what you expected? Could an error be more useful? ]
     #   [ Tell us: https://str4d.xyz/rage/report                            ]
     # This can be confusing in our case so strip them from the output.
-    return b"\n".join(
-        line
-        for line in output.split(b"\n")
-        if not line.startswith(b"[") and not line.endswith(b"]")
-    )
+    # A newline is prepended so that every line is matched along with its
+    # preceding newline.
+    return _RAGE_REPORT_LINE_RE.sub(b"", b"\n" + output)[1:]
 
 
 @recovery_bundle_cli_group.command(name="recover-decryption-key")
@@ -1322,15 +1658,16 @@ def rollover(
     ctx, recovery_bundles, decryption_key=None, identity=None, secret=None
 ) -> None:
     """Rollover recovery bundles to new shared secrets."""
-    conf = ctx.obj["config"]
+    from concurrent.futures import ThreadPoolExecutor
+    import os
 
-    from .recovery_bundle import RecoveryBundle, SecretSharing, WrongDecryptionKey
+    from .recovery_bundle import RecoveryBundle, WrongDecryptionKey
 
     secret_key_provider = get_object_decryption_key_provider(ctx)
-    secret_sharing = SecretSharing.from_dict(conf["recovery_bundles"]["secret_sharing"])
+    secret_sharing = get_secret_sharing(ctx)
     click.secho("New shared secret holders:")
     for share_id in sorted(secret_sharing.share_ids):
-        click.echo(f"- {click.style(share_id, fg='magenta', bold=True)}")
+        click.echo(f"- {_style_share_id(share_id)}")
     click.confirm(
         click.style(
             "Proceed with rolling over the shared secrets?",
@@ -1339,7 +1676,13 @@ def rollover(
         ),
         abort=True,
     )
-    for recovery_bundle in recovery_bundles:
+    # Recovering the decryption key of each bundle might require to interact
+    # with the user, so this happens sequentially for all bundles first.
+    # A bundle given twice must only be rewritten once.
+    bundles = []
+    for recovery_bundle in dict.fromkeys(
+        os.path.realpath(recovery_bundle) for recovery_bundle in recovery_bundles
+    ):
         bundle = RecoveryBundle(recovery_bundle, secret_key_provider)
         # Ensure that we can decrypt at least some objects with the provided key
         try:
@@ -1353,10 +1696,39 @@ def rollover(
                 bold=True,
             )
             ctx.exit(2)
+        bundles.append(bundle)
+
+    # Encrypting the new shares and rewriting the bundles only involves
+    # `rage` subprocesses and file I/O: bundles can be processed concurrently.
+    def rollover_one(bundle: RecoveryBundle) -> RecoveryBundle:
         bundle.rollover(secret_sharing)
-        click.secho("Shared secrets for ", fg="green", nl=False)
-        click.secho(bundle.removal_identifier, fg="green", bold=True, nl=False)
-        click.secho(" have been rolled over.", fg="green")
+        return bundle
+
+    if not bundles:
+        return
+    with ThreadPoolExecutor(max_workers=min(len(bundles), os.cpu_count() or 1)) as ex:
+        futures = [ex.submit(rollover_one, bundle) for bundle in bundles]
+    # A failure does not stop the other rollovers: report the outcome of
+    # every bundle, in the order they were given, so the operator knows
+    # which ones now carry the new shares.
+    failed = False
+    for bundle, future in zip(bundles, futures):
+        exc = future.exception()
+        if exc is None:
+            click.secho("Shared secrets for ", fg="green", nl=False)
+            click.secho(bundle.removal_identifier, fg="green", bold=True, nl=False)
+            click.secho(" have been rolled over.", fg="green")
+        else:
+            failed = True
+            click.secho(
+                f"Unable to roll over shared secrets for "
+                f"{bundle.removal_identifier}: {exc}",
+                err=True,
+                fg="red",
+                bold=True,
+            )
+    if failed:
+        ctx.exit(1)
 
 
 @alter_cli_group.group(
@@ -1430,7 +1802,7 @@ def handle_removal_notification_with_removal(
 
     from .inventory import RootsNotFound, StuckInventoryException
     from .operations import MaskingRequestNotFound, RemoverError
-    from .recovery_bundle import ContentDataNotFound, SecretSharing
+    from .recovery_bundle import ContentDataNotFound
 
     ignore_backends = set(ignore_backends or [])
 
@@ -1445,31 +1817,20 @@ def handle_removal_notification_with_removal(
         ignore_backends=ignore_backends,
     )
 
-    try:
-        secret_sharing = SecretSharing.from_dict(
-            ctx.obj["config"]["recovery_bundles"]["secret_sharing"]
-        )
-    except ValueError as e:
-        raise click.ClickException(f"Wrong secret sharing configuration: {e.args[0]}")
+    secret_sharing = get_secret_sharing(ctx)
 
-    try:
-        p = pathlib.Path(recovery_bundle)
-        p.touch(exist_ok=False)
-        p.unlink()
-    except FileExistsError:
-        raise click.ClickException(f"File “{recovery_bundle}” already exists")
-    except PermissionError:
-        raise click.ClickException(f"Permission denied: “{recovery_bundle}”")
+    _check_recovery_bundle_can_be_created(recovery_bundle)
 
     try:
-        remover.handle_removal_notification_with_removal(
-            notification_removal_identifier=removal_identifier,
-            secret_sharing=secret_sharing,
-            recovery_bundle_path=recovery_bundle,
-            ignore_requested=ignore_requested or [],
-            allow_empty_content_objects=allow_empty_content_objects,
-            recompute_swhids_to_remove=recompute,
-        )
+        with queued_logging():
+            remover.handle_removal_notification_with_removal(
+                notification_removal_identifier=removal_identifier,
+                secret_sharing=secret_sharing,
+                recovery_bundle_path=recovery_bundle,
+                ignore_requested=ignore_requested or [],
+                allow_empty_content_objects=allow_empty_content_objects,
+                recompute_swhids_to_remove=recompute,
+            )
     except MaskingRequestNotFound as e:
         click.secho(
             f"Masking request “{e.masking_request_slug}” has not been found.",
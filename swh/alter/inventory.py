@@ -51,17 +51,8 @@ class RootsNotFound(Exception):
         """Returns a list of either an origin URL if it can be found in requested and the
         SWHID otherwise."""
 
-        return [
-            next(
-                (
-                    x.url
-                    for x in requested
-                    if isinstance(x, Origin) and x.swhid() == swhid
-                ),
-                str(swhid),
-            )
-            for swhid in self.swhids
-        ]
+        origin_urls = {x.swhid(): x.url for x in requested if isinstance(x, Origin)}
+        return [origin_urls.get(swhid, str(swhid)) for swhid in self.swhids]
 
 
 class StuckInventoryException(Exception):
@@ -4,6 +4,7 @@
 # See top-level LICENSE file for more information
 
 import collections
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from functools import partial, reduce
 import itertools
@@ -14,8 +15,10 @@ import statistics
 import time
 from typing import (
     Any,
+    Callable,
     Dict,
     FrozenSet,
+    Iterable,
     Iterator,
     List,
     NamedTuple,
@@ -34,7 +37,23 @@ from swh.core.utils import grouper
 from swh.graph.http_client import RemoteGraphClient
 from swh.journal.writer.kafka import KafkaJournalWriter
 from swh.model.hashutil import HashDict
-from swh.model.model import BaseModel, Content, KeyType, Origin
+from swh.model.model import (
+    BaseModel,
+    Content,
+    Directory,
+    ExtID,
+    KeyType,
+    MetadataAuthority,
+    MetadataFetcher,
+    Origin,
+    OriginVisit,
+    OriginVisitStatus,
+    RawExtrinsicMetadata,
+    Release,
+    Revision,
+    SkippedContent,
+    Snapshot,
+)
 from swh.model.swhids import CoreSWHID, ExtendedObjectType, ExtendedSWHID
 from swh.model.swhids import ObjectType as CoreSWHIDObjectType
 from swh.objstorage.exc import Error as ObjstorageError
@@ -55,12 +74,15 @@ from .recovery_bundle import (
     generate_age_keypair,
 )
 from .removable import mark_removable
-from .utils import get_filtered_objects
+from .utils import filter_objects_missing_from_storage, get_filtered_objects
 
 logger = logging.getLogger(__name__)
 
 
 OBJSTORAGE_DELETE_MAX_ATTEMPTS = 3
+OBJSTORAGE_DELETE_MAX_WORKERS = 32
+FIND_RECENT_REFERENCES_MAX_WORKERS = 32
+SEARCH_DELETE_MAX_WORKERS = 16
 
 
 class RemoverError(Exception):
@@ -75,6 +97,27 @@ class MaskingRequestNotFound(Exception):
         return f"Masking request “{self.masking_request_slug}” not found."
 
 
+def _map_in_flight(
+    executor: ThreadPoolExecutor,
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_in_flight: int,
+) -> Iterator[Any]:
+    """Like ``executor.map(fn, items)``, but only keep up to ``max_in_flight``
+    calls submitted ahead of the results consumed so far.
+
+    ``executor.map()`` submits a call for every item up front. Here, memory use
+    stays bounded, and callers that stop consuming early or get an error can
+    cancel the few calls still pending by shutting down the executor."""
+    pending: collections.deque[Future[Any]] = collections.deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= max_in_flight:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
 def _secho(msg, **kwargs):
     """Log at info level, passing kwargs as styles for click.secho()"""
     logger.info(msg, extra={"style": kwargs})
@@ -111,18 +154,27 @@ class Removable(NamedTuple):
         sorted_swhids = sorted(
             self.removable_swhids, key=lambda swhid: ordering[swhid.object_type]
         )
-        _secho("Removal plan:")
+        lines = ["Removal plan:"]
         for object_type, grouped_swhids in itertools.groupby(
             sorted_swhids, key=operator.attrgetter("object_type")
         ):
-            _secho(f"- {object_type.name.capitalize()}: {len(list(grouped_swhids))}")
-        _secho(
+            lines.append(
+                f"- {object_type.name.capitalize()}: {sum(1 for _ in grouped_swhids)}"
+            )
+        lines.append(
             "- … and more objects that are not addresseable by a SWHID "
             "(OriginVisit, OriginVisitStatus, ExtID)."
         )
+        _secho("\n".join(lines))
 
 
 STORAGE_OBJECT_DELETE_CHUNK_SIZE = 200
+STORAGE_OBJECT_DELETE_MAX_IN_FLIGHT = 4
+JOURNAL_DELETE_CHUNK_SIZE = 10_000
+
+
+def _ignore_for_storage(obj: BaseModel) -> None:
+    pass
 
 
 class Remover:
@@ -162,6 +214,31 @@ class Remover:
         self.progressbar: ProgressBarInit = (
             progressbar if progressbar is not None else no_progressbar
         )
+        # Objects come in large batches of the same type: pick the
+        # registration code once per type instead of probing each object
+        self._register_for_storage_by_type: Dict[type, Callable[[Any], None]] = {
+            Content: self._register_content_for_storage,
+            SkippedContent: self._register_skipped_content_for_storage,
+            Directory: self._register_core_swhid_for_storage,
+            Revision: self._register_core_swhid_for_storage,
+            Release: self._register_core_swhid_for_storage,
+            Snapshot: self._register_core_swhid_for_storage,
+            Origin: self._register_extended_swhid_for_storage,
+            RawExtrinsicMetadata: self._register_extended_swhid_for_storage,
+            # Objects without SWHIDs are removed along with the objects
+            # they belong to
+            OriginVisit: _ignore_for_storage,
+            OriginVisitStatus: _ignore_for_storage,
+            ExtID: _ignore_for_storage,
+            MetadataAuthority: _ignore_for_storage,
+            MetadataFetcher: _ignore_for_storage,
+        }
+
+    @property
+    def journal_object_count(self) -> int:
+        """Number of objects registered for removal from the journal."""
+        # Only one list per object type: this adds up a handful of lengths
+        return sum(map(len, self.journal_objects_to_remove.values()))
 
     def get_removable(
         self,
@@ -213,12 +290,68 @@ class Remover:
         )
 
     def register_object(self, obj: BaseModel) -> None:
-        # Register for removal from storage
-        if hasattr(obj, "swhid"):
+        self._register_for_storage_by_type.get(
+            type(obj), self._register_object_for_storage
+        )(obj)
+        # Register for removal from the journal
+        # `.value` is the same string as `str()`, without the method call
+        self.journal_objects_to_remove[obj.object_type.value].append(obj.unique_key())
+        # Register for removal from search
+        if isinstance(obj, Origin):
+            self.origin_urls_to_remove.append(obj.url)
+
+    def _register_objects_of_same_type(
+        self, objs: Iterable[BaseModel], bar: Optional[ProgressBar[int]] = None
+    ) -> None:
+        """Like :py:meth:`register_object`, for objects which are all of the
+        same type and not origins, looking up their journal list only once."""
+        journal_keys: Optional[List[KeyType]] = None
+        register_for_storage: Callable[[Any], None] = self._register_object_for_storage
+        for obj in objs:
+            if journal_keys is None:
+                register_for_storage = self._register_for_storage_by_type.get(
+                    type(obj), register_for_storage
+                )
+                journal_keys = self.journal_objects_to_remove[obj.object_type.value]
+            register_for_storage(obj)
+            journal_keys.append(obj.unique_key())
+            if bar is not None:
+                bar.update(n_steps=1)
+
+    def _register_content_for_storage(self, content: Content) -> None:
+        self.swhids_to_remove.append(content.swhid().to_extended())
+        # Only the hashes are needed, not a full serialization
+        self.objids_to_remove.append(objid_from_dict(content.hashes()))
+
+    def _register_skipped_content_for_storage(
+        self, skipped_content: SkippedContent
+    ) -> None:
+        swhid = skipped_content.swhid()
+        if swhid is not None:
+            self.swhids_to_remove.append(swhid.to_extended())
+            # Matches what we do for contents, even though the objstorage
+            # is not expected to hold the data
+            self.objids_to_remove.append(objid_from_dict(skipped_content.hashes()))
+
+    def _register_core_swhid_for_storage(
+        self, obj: Directory | Revision | Release | Snapshot
+    ) -> None:
+        self.swhids_to_remove.append(obj.swhid().to_extended())
+
+    def _register_extended_swhid_for_storage(
+        self, obj: Origin | RawExtrinsicMetadata
+    ) -> None:
+        self.swhids_to_remove.append(obj.swhid())
+
+    def _register_object_for_storage(self, obj: BaseModel) -> None:
+        """Generic fallback for types missing from
+        ``_register_for_storage_by_type``."""
+        get_swhid = getattr(obj, "swhid", None)
+        if get_swhid is not None:
             # StorageInterface.ObjectDeletionInterface.remove uses SWHIDs
             # for reference. We hope it will handle objects without SWHIDs
             # (origin_visit, origin_visit_status) directly.
-            obj_swhid = obj.swhid()
+            obj_swhid = get_swhid()
             if obj_swhid is not None:
                 swhid = (
                     obj_swhid.to_extended()
@@ -228,12 +361,8 @@ class Remover:
                 self.swhids_to_remove.append(swhid)
                 if swhid.object_type == ExtendedObjectType.CONTENT:
                     content = cast(Content, obj)
-                    self.objids_to_remove.append(objid_from_dict(content.to_dict()))
-        # Register for removal from the journal
-        self.journal_objects_to_remove[str(obj.object_type)].append(obj.unique_key())
-        # Register for removal from search
-        if isinstance(obj, Origin):
-            self.origin_urls_to_remove.append(obj.url)
+                    # Only the hashes are needed, not a full serialization
+                    self.objids_to_remove.append(objid_from_dict(content.hashes()))
 
     def register_objects_from_bundle(
         self, recovery_bundle_path: str, object_secret_key: AgeSecretKey
@@ -253,35 +382,21 @@ class Remover:
         self.recovery_bundle_path = recovery_bundle_path
         self.object_secret_key = object_secret_key
 
-        iterchain = [
-            bundle.contents(),
-            bundle.skipped_contents(),
-            bundle.directories(),
-            bundle.revisions(),
-            bundle.releases(),
-            bundle.snapshots(),
-        ]
-        if bundle.version >= 2:
-            iterchain.extend(
-                [
-                    bundle.raw_extrinsic_metadata(),
-                    bundle.extids(),
-                ]
-            )
         bar: ProgressBar[int]
         with self.progressbar(
             length=len(bundle.swhids), label="Loading objects…"
         ) as bar:
-            for obj in itertools.chain(*iterchain):
-                self.register_object(obj)
-                bar.update(n_steps=1)
-            for origin in bundle.origins():
-                self.register_object(origin)
-                for obj in itertools.chain(
-                    bundle.origin_visits(origin), bundle.origin_visit_statuses(origin)
-                ):
-                    self.register_object(obj)
-                bar.update(n_steps=1)
+            for cls, objs in bundle.objects_by_type():
+                if cls is Origin:
+                    for origin in objs:
+                        self.register_object(origin)
+                        bar.update(n_steps=1)
+                else:
+                    # Only objects with a SWHID are counted in the bundle
+                    self._register_objects_of_same_type(
+                        objs,
+                        bar if cls not in (OriginVisit, OriginVisitStatus) else None,
+                    )
         return bundle
 
     def create_recovery_bundle(
@@ -342,24 +457,48 @@ class Remover:
         result.pop("object_reference:add", None)
         total = sum(result.values())
         _secho(f"{total} objects restored.", fg="green")
-        count_from_journal_objects = sum(
-            len(objects) for objects in self.journal_objects_to_remove.values()
-        )
-        if count_from_journal_objects != total:
+        if self.journal_object_count != total:
             _secho(
-                f"{count_from_journal_objects} objects should have "
+                f"{self.journal_object_count} objects should have "
                 "been restored. Something might be wrong!",
                 fg="red",
                 bold=True,
             )
 
+    def _run_for_each_backend(
+        self, fn: Callable[[str, Any], Any], backends: Dict[str, Any]
+    ) -> List[Any]:
+        """Call ``fn(name, backend)`` for each of the given backends and return
+        the results.
+
+        Backends of the same kind are independent services, so when there are
+        several of them the calls run concurrently. Progress bars are then
+        not displayed, as they cannot share the terminal.
+
+        Each thread gets its own backend client, which no other thread uses.
+        The only state shared between threads are the sets of objects to
+        remove held by the :py:class:`Remover`, which are only read here.
+
+        If a call fails, the calls for the other backends are not
+        interrupted: they keep running to completion, along with their own
+        worker threads if any, before the first error is raised."""
+        if len(backends) <= 1:
+            return [fn(name, backend) for name, backend in backends.items()]
+        progressbar, self.progressbar = self.progressbar, no_progressbar
+        try:
+            with ThreadPoolExecutor(max_workers=len(backends)) as executor:
+                return list(executor.map(fn, backends.keys(), backends.values()))
+        finally:
+            self.progressbar = progressbar
+
     def remove(self, progressbar=None) -> None:
-        for name, removal_search in self.removal_searches.items():
-            self.remove_from_search(name, removal_search)
-        for name, removal_storage in self.removal_storages.items():
-            self.remove_from_storage(name, removal_storage)
-        for name, journal_writer in self.removal_journals.items():
-            self.remove_from_journal(name, journal_writer)
+        # Kinds of backends are still handled one after the other, from search
+        # to objstorages: if removal fails on a backend, the kinds after it are
+        # left untouched. Backends of the failing kind are all processed
+        # though, as they run concurrently.
+        self._run_for_each_backend(self.remove_from_search, self.removal_searches)
+        self._run_for_each_backend(self.remove_from_storage, self.removal_storages)
+        self._run_for_each_backend(self.remove_from_journal, self.removal_journals)
         if len(self.removal_objstorages) > 0:
             self.remove_from_objstorages()
         if self.have_new_references(self.swhids_to_remove):
@@ -371,31 +510,56 @@ class Remover:
     def remove_from_storage(
         self, name: str, removal_storage: ObjectDeletionInterface
     ) -> None:
+        def remove_chunk(chunk_swhids: List[ExtendedSWHID]) -> Dict[str, int]:
+            # Remove objects addressable by a SWHID
+            chunk_results = collections.Counter(
+                removal_storage.object_delete(chunk_swhids)
+            )
+            # Remove ExtIDs (addressable by their targets)
+            chunk_core_swhids = [
+                CoreSWHID(
+                    object_type=CoreSWHIDObjectType[extended_swhid.object_type.name],
+                    object_id=extended_swhid.object_id,
+                )
+                for extended_swhid in chunk_swhids
+                if hasattr(CoreSWHIDObjectType, extended_swhid.object_type.name)
+            ]
+            chunk_results += removal_storage.extid_delete_for_target(chunk_core_swhids)
+            return chunk_results
+
         results: collections.Counter[str] = collections.Counter()
         bar: ProgressBar[int]
-        with self.progressbar(
-            length=len(self.swhids_to_remove),
-            label=f"Removing objects from storage “{name}”…",
-        ) as bar:
-            for chunk_it in grouper(
-                self.swhids_to_remove, STORAGE_OBJECT_DELETE_CHUNK_SIZE
-            ):
-                chunk_swhids = list(chunk_it)
-                # Remove objects addressable by a SWHID
-                results += removal_storage.object_delete(chunk_swhids)
-                # Remove ExtIDs (addressable by their targets)
-                chunk_core_swhids = [
-                    CoreSWHID(
-                        object_type=CoreSWHIDObjectType[
-                            extended_swhid.object_type.name
-                        ],
-                        object_id=extended_swhid.object_id,
+        # Keep a few chunks in flight so the storage does not wait on us
+        pending: collections.deque[Tuple[int, Future[Dict[str, int]]]] = (
+            collections.deque()
+        )
+        with (
+            self.progressbar(
+                length=len(self.swhids_to_remove),
+                label=f"Removing objects from storage “{name}”…",
+            ) as bar,
+            ThreadPoolExecutor(
+                max_workers=STORAGE_OBJECT_DELETE_MAX_IN_FLIGHT
+            ) as executor,
+        ):
+            try:
+                for chunk_it in grouper(
+                    self.swhids_to_remove, STORAGE_OBJECT_DELETE_CHUNK_SIZE
+                ):
+                    chunk_swhids = list(chunk_it)
+                    pending.append(
+                        (len(chunk_swhids), executor.submit(remove_chunk, chunk_swhids))
                     )
-                    for extended_swhid in chunk_swhids
-                    if hasattr(CoreSWHIDObjectType, extended_swhid.object_type.name)
-                ]
-                results += removal_storage.extid_delete_for_target(chunk_core_swhids)
-                bar.update(n_steps=len(chunk_swhids))
+                    if len(pending) >= STORAGE_OBJECT_DELETE_MAX_IN_FLIGHT:
+                        chunk_len, future = pending.popleft()
+                        results += future.result()
+                        bar.update(n_steps=chunk_len)
+                while pending:
+                    chunk_len, future = pending.popleft()
+                    results += future.result()
+                    bar.update(n_steps=chunk_len)
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
         _secho(
             f"{results.total()} objects removed from storage “{name}”.",
             fg="green",
@@ -404,31 +568,53 @@ class Remover:
     def remove_from_journal(
         self, name: str, journal_writer: KafkaJournalWriter
     ) -> None:
-        bar: ProgressBar[Tuple[str, List[KeyType]]]
+        bar: ProgressBar[int]
         with self.progressbar(
-            self.journal_objects_to_remove.items(),
+            length=self.journal_object_count,
             label=f"Removing objects from journal “{name}”…",
         ) as bar:
-            for object_type, keys in bar:
-                journal_writer.delete(object_type, keys)
+            for object_type, keys in self.journal_objects_to_remove.items():
+                for chunk_it in grouper(keys, JOURNAL_DELETE_CHUNK_SIZE):
+                    chunk_keys = list(chunk_it)
+                    journal_writer.delete(object_type, chunk_keys)
+                    # Serve delivery callbacks so the producer queue does not
+                    # fill up, which would make further tombstones wait
+                    journal_writer.producer.poll(0)
+                    bar.update(n_steps=len(chunk_keys))
         journal_writer.flush()
         _secho(f"Objects removed from journal “{name}”.", fg="green")
 
     def remove_from_search(self, name: str, search: SearchInterface) -> None:
         count = 0
-        with self.progressbar(
-            self.origin_urls_to_remove, label=f"Removing origins from search “{name}”…"
-        ) as bar:
-            for origin_url in bar:
-                deleted = search.origin_delete(origin_url)
-                count += 1 if deleted else 0
-            search.flush()
+        # SearchInterface has no bulk deletion: pipeline the requests instead
+        bar: ProgressBar[int]
+        with (
+            self.progressbar(
+                length=len(self.origin_urls_to_remove),
+                label=f"Removing origins from search “{name}”…",
+            ) as bar,
+            ThreadPoolExecutor(max_workers=SEARCH_DELETE_MAX_WORKERS) as executor,
+        ):
+            try:
+                for deleted in _map_in_flight(
+                    executor,
+                    search.origin_delete,
+                    self.origin_urls_to_remove,
+                    2 * SEARCH_DELETE_MAX_WORKERS,
+                ):
+                    count += 1 if deleted else 0
+                    bar.update(1)
+            finally:
+                # On error, do not start the deletions still waiting, but wait
+                # for the running ones so that all deletions made get flushed
+                executor.shutdown(cancel_futures=True)
+                search.flush()
         _secho(f"{count} origins removed from search “{name}”.", fg="green")
 
     def remove_from_objstorages(self):
-        results = []
-        for name, removal_objstorage in self.removal_objstorages.items():
-            results.append(self.remove_from_objstorage(name, removal_objstorage))
+        results = self._run_for_each_backend(
+            self.remove_from_objstorage, self.removal_objstorages
+        )
         not_found = reduce(set.intersection, results)
         if not_found:
             table = tabulate(
@@ -442,6 +628,42 @@ class Remover:
             )
             _secho(f"Objects not found in any objstorage:\n{table}", fg="red")
 
+    def _delete_from_objstorage(
+        self, name: str, objstorage: ObjStorageInterface, objid: HashDict
+    ) -> Optional[float]:
+        """Delete an object from the given objstorage, retrying on unexpected
+        errors.
+
+        Returns:
+            how long the deletion took in seconds, or None if the object
+            could not be found
+        """
+        attempt = 1
+        while True:
+            try:
+                start = time.monotonic()
+                objstorage.delete(objid)
+                return time.monotonic() - start
+            except ObjNotFoundError:
+                return None
+            except ObjstorageError as e:
+                raise e
+            except Exception as e:
+                if attempt >= OBJSTORAGE_DELETE_MAX_ATTEMPTS:
+                    raise e
+                else:
+                    cooldown = 5 * attempt
+                    logger.warning(
+                        "objstorage “%s” raised “%r” during attempt %d, "
+                        "retrying in %d seconds…",
+                        name,
+                        e,
+                        attempt,
+                        cooldown,
+                    )
+                    time.sleep(cooldown)
+            attempt += 1
+
     def remove_from_objstorage(
         self,
         name: str,
@@ -450,46 +672,39 @@ class Remover:
         count = 0
         not_found: Set[FrozenSet[Tuple[str, str]]] = set()
         durations = []
-        with self.progressbar(
-            self.objids_to_remove, label=f"Removing objects from objstorage “{name}”…"
-        ) as bar:
-            for objid in bar:
-                attempt = 1
-                while True:
-                    try:
-                        start = time.monotonic()
-                        objstorage.delete(objid)
-                        durations.append(time.monotonic() - start)
+        # Deletions are independent requests: run them concurrently
+        bar: ProgressBar[int]
+        with (
+            self.progressbar(
+                length=len(self.objids_to_remove),
+                label=f"Removing objects from objstorage “{name}”…",
+            ) as bar,
+            ThreadPoolExecutor(max_workers=OBJSTORAGE_DELETE_MAX_WORKERS) as executor,
+        ):
+            try:
+                results = _map_in_flight(
+                    executor,
+                    partial(self._delete_from_objstorage, name, objstorage),
+                    self.objids_to_remove,
+                    2 * OBJSTORAGE_DELETE_MAX_WORKERS,
+                )
+                for objid, duration in zip(self.objids_to_remove, results):
+                    bar.update(1)
+                    if duration is not None:
+                        durations.append(duration)
                         count += 1
-                        break
-                    except ObjNotFoundError:
-                        # hex form is nicer to read
-                        objid_hex = {k: cast(bytes, v).hex() for k, v in objid.items()}
-                        # convert to a frozenset of tuples as dicts are not hashable
-                        not_found.add(frozenset(objid_hex.items()))
-                        logger.debug(
-                            "%s not found in objstorage “%s” for deletion",
-                            objid_hex,
-                            name,
-                        )
-                        break
-                    except ObjstorageError as e:
-                        raise e
-                    except Exception as e:
-                        if attempt >= OBJSTORAGE_DELETE_MAX_ATTEMPTS:
-                            raise e
-                        else:
-                            cooldown = 5 * attempt
-                            logger.warning(
-                                "objstorage “%s” raised “%r” during attempt %d, "
-                                "retrying in %d seconds…",
-                                name,
-                                e,
-                                attempt,
-                                cooldown,
-                            )
-                            time.sleep(cooldown)
-                    attempt += 1
+                        continue
+                    # hex form is nicer to read
+                    objid_hex = {k: cast(bytes, v).hex() for k, v in objid.items()}
+                    # convert to a frozenset of tuples as dicts are not hashable
+                    not_found.add(frozenset(objid_hex.items()))
+                    logger.debug(
+                        "%s not found in objstorage “%s” for deletion",
+                        objid_hex,
+                        name,
+                    )
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
         stats = (
             (
                 f" Total time: {format_duration(sum(durations))},"
@@ -514,19 +729,55 @@ class Remover:
         an object outside the set of removed objects."""
 
         swhids = set(removed_swhids)
-        with self.progressbar(
-            swhids, label="Looking for newly added references…"
-        ) as bar:
-            for swhid in bar:
-                if swhid.object_type == ExtendedObjectType.ORIGIN:
-                    continue
-                recent_references = get_filtered_objects(
-                    self.storage,
-                    partial(self.storage.object_find_recent_references, swhid),
-                    len(swhids) + 1,
-                )
-                if not swhids.issuperset(set(recent_references)):
-                    return True
+        swhids_to_check = [
+            swhid for swhid in swhids if swhid.object_type != ExtendedObjectType.ORIGIN
+        ]
+
+        # More references than removed objects means some come from outside
+        limit = len(swhids) + 1
+
+        def has_new_references(swhid: ExtendedSWHID) -> bool:
+            references = self.storage.object_find_recent_references(swhid, limit)
+            # References to objects missing from the storage do not count, but
+            # checking for them costs more round trips. Most of the time, all
+            # references come from removed objects and there is nothing to check.
+            outside_references = [r for r in references if r not in swhids]
+            if outside_references and filter_objects_missing_from_storage(
+                self.storage, outside_references
+            ):
+                return True
+            if len(references) < limit:
+                return False
+            # Some references were ignored and there might be more
+            recent_references = get_filtered_objects(
+                self.storage,
+                partial(self.storage.object_find_recent_references, swhid),
+                limit,
+            )
+            return any(r not in swhids for r in recent_references)
+
+        # Each lookup is a round trip to the storage: run them concurrently
+        bar: ProgressBar[int]
+        with (
+            self.progressbar(
+                length=len(swhids_to_check), label="Looking for newly added references…"
+            ) as bar,
+            ThreadPoolExecutor(
+                max_workers=FIND_RECENT_REFERENCES_MAX_WORKERS
+            ) as executor,
+        ):
+            try:
+                for found in _map_in_flight(
+                    executor,
+                    has_new_references,
+                    swhids_to_check,
+                    2 * FIND_RECENT_REFERENCES_MAX_WORKERS,
+                ):
+                    bar.update(1)
+                    if found:
+                        return True
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
         return False
 
     @staticmethod
@@ -4,6 +4,7 @@
 # See top-level LICENSE file for more information
 
 import logging
+import time
 from types import TracebackType
 from typing import Callable, Generic, Iterable, Iterator, Protocol, TypeVar, cast
 
@@ -54,15 +55,64 @@ class NoProgressBar(Generic[V]):
         pass
 
     def __iter__(self) -> Iterator[V]:
-        yield from self.iter
+        return self.iter
 
     def __next__(self) -> V:
-        return next(iter(self))
+        return next(self.iter)
 
     def update(self, n_steps: int, current_item: V | None = None) -> None:
         pass
 
 
+class ThrottledProgressBar(Generic[V]):
+    """Wraps a :py:class:`ProgressBar` to forward updates at most once every
+    ``interval`` seconds.
+
+    Updates in between are accumulated, so that loops over millions of objects
+    can call :py:meth:`update` for each of them without redrawing the bar
+    every time."""
+
+    def __init__(self, bar: ProgressBar[V], interval: float = 0.1):
+        self.bar = bar
+        self.interval = interval
+        self._pending_steps = 0
+        self._current_item: V | None = None
+        self._next_update = 0.0
+
+    def __enter__(self) -> "ThrottledProgressBar[V]":
+        self.bar.__enter__()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self._flush()
+        self.bar.__exit__(exc_type, exc_value, tb)
+
+    def __iter__(self) -> Iterator[V]:
+        return iter(self.bar)
+
+    def __next__(self) -> V:
+        return next(self.bar)
+
+    def update(self, n_steps: int, current_item: V | None = None) -> None:
+        self._pending_steps += n_steps
+        if current_item is not None:
+            self._current_item = current_item
+        if time.monotonic() >= self._next_update:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._pending_steps or self._current_item is not None:
+            self.bar.update(self._pending_steps, current_item=self._current_item)
+            self._pending_steps = 0
+            self._current_item = None
+        self._next_update = time.monotonic() + self.interval
+
+
 class ProgressBarInit(Protocol):
     """A protocol abstracting the ``click.progressbar()`` function."""
 
@@ -98,6 +148,6 @@ def no_progressbar(
         # Without this `cast()`, mypy thinks we return a `ProgressBar[int]`.
         # While true, it only happens in the case that V has not been specified,
         # so we are in our rights to state that V=int this time being.
-        return NoProgressBar(cast(Iterable[V], iter(range(0, length))), label=label)
+        return NoProgressBar(cast(Iterable[V], range(length)), label=label)
     else:
         raise ValueError("Either `iterable or `length` must be specified.")
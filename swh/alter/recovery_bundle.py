@@ -3,9 +3,12 @@
 # License: GNU General Public License version 3, or any later version
 # See top-level LICENSE file for more information
 
+import bisect
 import collections
+from concurrent.futures import Future, ThreadPoolExecutor
 import contextlib
 from datetime import datetime, timezone
+import functools
 import itertools
 import logging
 import operator
@@ -23,6 +26,7 @@ from typing import (
     Callable,
     Collection,
     Dict,
+    FrozenSet,
     Iterable,
     Iterator,
     List,
@@ -34,7 +38,7 @@ from typing import (
     Type,
     Union,
 )
-from zipfile import ZipFile
+from zipfile import ZipFile, ZipInfo
 
 import attrs
 import shamir_mnemonic
@@ -86,6 +90,10 @@ RECOVERY_BUNDLE_RESTORE_CHUNK_SIZE = 200
 logger = logging.getLogger(__name__)
 
 
+# Manifests list every removed SWHID: use libyaml to parse them when available
+_ManifestLoader: Type[yaml.SafeLoader] = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
 class _ManifestDumper(yaml.SafeDumper):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -190,7 +198,7 @@ class Manifest:
 
     @classmethod
     def load(cls, str_or_stream: Union[str, TextIO]) -> "Manifest":
-        d = yaml.safe_load(str_or_stream)
+        d = yaml.load(str_or_stream, Loader=_ManifestLoader)
         if not isinstance(d, dict):
             raise ValueError("Invalid manifest: not a mapping")
         if not isinstance(d.get("version"), int):
@@ -261,15 +269,22 @@ def age_encrypt_armored(
     return age_encrypt(public_key, cleartext, armored_output=True).decode("us-ascii")
 
 
+def _write_identity_file(secret_key: AgeSecretKey) -> TextIO:
+    """Write the given secret key to a temporary identity file readable only by
+    the current user. The file is removed once closed."""
+    identity_file = tempfile.NamedTemporaryFile("w")
+    os.chmod(identity_file.name, 0o400)
+    identity_file.write(secret_key)
+    identity_file.write("\n")
+    identity_file.flush()
+    return typing.cast(TextIO, identity_file)
+
+
 def age_decrypt(
     secret_key: AgeSecretKey,
     ciphertext: Union[AgeEncryptedPayload, AgeArmoredEncryptedPayload],
 ) -> bytes:
-    with tempfile.NamedTemporaryFile("w") as identity_file:
-        os.chmod(identity_file.name, 0o400)
-        identity_file.write(secret_key)
-        identity_file.write("\n")
-        identity_file.flush()
+    with _write_identity_file(secret_key) as identity_file:
         return age_decrypt_from_identity(identity_file.name, ciphertext)
 
 
@@ -526,6 +541,7 @@ class UnsupportedFeatureException(Exception):
 
 
 MANIFEST_ARCNAME = "manifest.yml"
+BUNDLE_DECRYPTION_MAX_WORKERS = 8
 
 
 class RecoveryBundle:
@@ -572,6 +588,11 @@ class RecoveryBundle:
     def swhids(self) -> List[ExtendedSWHID]:
         return self._manifest.swhids
 
+    @functools.cached_property
+    def swhids_set(self) -> FrozenSet[ExtendedSWHID]:
+        """The SWHIDs of the objects in the bundle, for fast membership tests."""
+        return frozenset(self._manifest.swhids)
+
     @property
     def referencing(self) -> List[ExtendedSWHID]:
         if self.version < 3:
@@ -592,6 +613,10 @@ class RecoveryBundle:
     def share_ids(self) -> Set[ShareIdentifier]:
         return set(self._manifest.decryption_key_shares.keys())
 
+    @functools.cached_property
+    def sorted_share_ids(self) -> Tuple[ShareIdentifier, ...]:
+        return tuple(sorted(self._manifest.decryption_key_shares.keys()))
+
     @property
     def object_decryption_key(self) -> AgeSecretKey:
         if self._cached_object_decryption_key is None:
@@ -609,6 +634,42 @@ class RecoveryBundle:
         assert result is not None
         return result
 
+    def _decrypt_members(self, zip_infos: Sequence[ZipInfo]) -> Iterator[bytes]:
+        """Decrypt the given archive members, yielding results in order.
+
+        Each decryption runs `rage` in a subprocess. Up to
+        ``BUNDLE_DECRYPTION_MAX_WORKERS`` of them run concurrently, so that
+        the following objects get decrypted while the caller is processing the
+        current one.
+
+        The object decryption key is written to a single identity file for
+        all the given members. It is removed once they have been decrypted,
+        or when the iteration is abandoned."""
+        if not zip_infos:
+            return
+        pending: collections.deque[Future[bytes]] = collections.deque()
+        # Retrieve the key from the calling thread, as this might prompt
+        with (
+            _write_identity_file(self.object_decryption_key) as identity_file,
+            ThreadPoolExecutor(max_workers=BUNDLE_DECRYPTION_MAX_WORKERS) as executor,
+        ):
+            try:
+                for zip_info in zip_infos:
+                    pending.append(
+                        executor.submit(
+                            age_decrypt_from_identity,
+                            identity_file.name,
+                            self._zip.read(zip_info),
+                        )
+                    )
+                    # Bound the number of decrypted objects waiting in memory
+                    if len(pending) >= 2 * BUNDLE_DECRYPTION_MAX_WORKERS:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
+
     def _extract(self, arcname: str) -> bytes:
         with self._zip.open(arcname) as f:
             return age_decrypt(self.object_decryption_key, f.read())
@@ -623,27 +684,37 @@ class RecoveryBundle:
             raise ValueError("Unserialized Content has no data")
         dest.write(content.data)
 
+    @functools.cached_property
+    def _members_by_dir(self) -> Dict[str, Tuple[List[str], List[ZipInfo]]]:
+        """Archive members sorted by name, grouped by top-level directory.
+
+        Names are kept in a separate list so members sharing a prefix can be
+        found by bisection, instead of scanning the whole archive index for
+        every object type and for every origin."""
+        members: Dict[str, Tuple[List[str], List[ZipInfo]]] = {}
+        for zip_info in sorted(
+            self._zip.infolist(), key=operator.attrgetter("filename")
+        ):
+            if zip_info.is_dir() or "/" not in zip_info.filename:
+                continue
+            dir, name = zip_info.filename.split("/", 1)
+            names, zip_infos = members.setdefault(dir, ([], []))
+            names.append(name)
+            zip_infos.append(zip_info)
+        return members
+
     def _objects(
         self,
         dir: str,
         cls: Type[BaseModel],
-        name_filter: Optional[Callable[[str], bool]] = None,
+        name_prefix: str = "",
     ):
-        if name_filter is None:
-            name_filter = lambda name: True  # noqa: E731
-        for zip_info in sorted(
-            self._zip.infolist(), key=operator.attrgetter("filename")
-        ):
-            if not zip_info.filename.startswith(f"{dir}/"):
-                continue
-            if zip_info.is_dir():
-                continue
-            if not name_filter(zip_info.filename.split("/")[-1]):
-                continue
-            d = kafka_to_value(
-                age_decrypt(self.object_decryption_key, self._zip.read(zip_info))
-            )
-            yield cls.from_dict(d)
+        names, zip_infos = self._members_by_dir.get(dir, ([], []))
+        start = end = bisect.bisect_left(names, name_prefix)
+        while end < len(names) and names[end].startswith(name_prefix):
+            end += 1
+        for serialized in self._decrypt_members(zip_infos[start:end]):
+            yield cls.from_dict(kafka_to_value(serialized))
 
     def contents(self) -> Iterator[Content]:
         yield from self._objects("contents", Content)
@@ -668,16 +739,12 @@ class RecoveryBundle:
 
     def origin_visits(self, origin: Origin) -> Iterator[OriginVisit]:
         basename = str(origin.swhid()).replace(":", "_")
-        yield from self._objects(
-            "origin_visits", OriginVisit, lambda name: name.startswith(basename)
-        )
+        yield from self._objects("origin_visits", OriginVisit, name_prefix=basename)
 
     def origin_visit_statuses(self, origin: Origin) -> Iterator[OriginVisitStatus]:
         basename = str(origin.swhid()).replace(":", "_")
         yield from self._objects(
-            "origin_visit_statuses",
-            OriginVisitStatus,
-            lambda name: name.startswith(basename),
+            "origin_visit_statuses", OriginVisitStatus, name_prefix=basename
         )
 
     def raw_extrinsic_metadata(self) -> Iterator[RawExtrinsicMetadata]:
@@ -690,6 +757,29 @@ class RecoveryBundle:
             return
         yield from self._objects("extids", ExtID)
 
+    def objects_by_type(self) -> Iterator[Tuple[Type[BaseModel], Iterator[Any]]]:
+        """Iterate over all objects in the bundle, one type at a time.
+
+        Yields each model class along with an iterator over the objects of
+        that type. Unlike :py:meth:`origin_visits` and
+        :py:meth:`origin_visit_statuses`, visits and statuses of all origins
+        are returned at once, in a single walk of the archive index."""
+        for dir, cls in (
+            ("contents", Content),
+            ("skipped_contents", SkippedContent),
+            ("directories", Directory),
+            ("revisions", Revision),
+            ("releases", Release),
+            ("snapshots", Snapshot),
+            ("raw_extrinsic_metadata", RawExtrinsicMetadata),
+            ("extids", ExtID),
+            ("origins", Origin),
+            ("origin_visits", OriginVisit),
+            ("origin_visit_statuses", OriginVisitStatus),
+        ):
+            # Bundles older than version 2 simply lack some directories
+            yield cls, self._objects(dir, cls)
+
     def get_missing_referenced_objects(
         self, storage: StorageInterface
     ) -> Set[ExtendedSWHID]:
@@ -828,6 +918,8 @@ class RecoveryBundle:
         ) as f:
             try:
                 self._manifest.decryption_key_shares = new_decryption_key_shares
+                # Share identifiers might have changed
+                self.__dict__.pop("sorted_share_ids", None)
                 with ZipFile(f, "a") as new_zip:
                     for zipinfo in self._zip.infolist():
                         # We skip the old manifest…
@@ -842,6 +934,7 @@ class RecoveryBundle:
                 os.rename(f.name, bundle_path)
                 # Reopen the current zip file
                 self._zip = ZipFile(bundle_path, "r")
+                self.__dict__.pop("_members_by_dir", None)
             finally:
                 # Always unlink the temporary file path. Either it already has
                 # been renamed to the old file, or something went wrong.
@@ -3,16 +3,19 @@
 # License: GNU General Public License version 3, or any later version
 # See top-level LICENSE file for more information
 
+import copy
 import datetime
-from functools import partial
+from functools import lru_cache, partial
 import os
-from typing import Iterator
+from typing import Any, Dict, Iterable, Iterator, List, Set, Tuple
 
 import pytest
 from pytest_postgresql import factories
+import yaml
 
 from swh.core.db.db_utils import initialize_database_for_module
 import swh.graph.example_dataset as graph_dataset
+from swh.graph.http_naive_client import NaiveClient
 from swh.journal.client import get_journal_client
 from swh.journal.writer import get_journal_writer
 from swh.model.model import (
@@ -45,11 +48,15 @@ from ..subgraph import Subgraph
 # ============
 
 
+@lru_cache(maxsize=None)
 def h(id: int, width=40) -> bytes:
-    return bytes.fromhex(f"{id:0{width}}")
+    # The decimal digits of `id` are used as hexadecimal digits so that
+    # h(20) matches “swh:1:snp:0000000000000000000000000000000000000020”
+    # from swh.graph.example_dataset.
+    return int(str(id), 16).to_bytes(width // 2, "big")
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def snapshot_20_with_multiple_branches_pointing_to_the_same_head():
     # No snapshot in the example dataset has multiple branches
     # or tags pointing to the same head. It’s pretty common in
@@ -70,7 +77,7 @@ def snapshot_20_with_multiple_branches_pointing_to_the_same_head():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def directory_6_with_multiple_entries_pointing_to_the_same_content():
     # No directories in the example dataset has multiple entries
     # pointing to the same content. It can happen in the real world,
@@ -100,7 +107,7 @@ def directory_6_with_multiple_entries_pointing_to_the_same_content():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_extids():
     extid_snp = ExtID(
         target=CoreSWHID(object_type=CoreSWHIDObjectType.SNAPSHOT, object_id=h(20)),
@@ -148,7 +155,7 @@ def sample_extids():
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_metadata_authority_registry():
     return MetadataAuthority(
         type=MetadataAuthorityType.REGISTRY,
@@ -156,7 +163,7 @@ def sample_metadata_authority_registry():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_metadata_authority_deposit():
     return MetadataAuthority(
         type=MetadataAuthorityType.DEPOSIT_CLIENT,
@@ -164,7 +171,7 @@ def sample_metadata_authority_deposit():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_metadata_fetcher():
     return MetadataFetcher(
         name="swh-example",
@@ -172,7 +179,15 @@ def sample_metadata_fetcher():
     )
 
 
-@pytest.fixture
+DISCOVERY_DATE_2015 = datetime.datetime(
+    2015, 1, 1, 21, 0, 0, tzinfo=datetime.timezone.utc
+)
+DISCOVERY_DATE_2016 = datetime.datetime(
+    2016, 1, 1, 21, 0, 0, tzinfo=datetime.timezone.utc
+)
+
+
+@pytest.fixture(scope="module")
 def sample_raw_extrinsic_metadata_objects(
     sample_metadata_authority_registry,
     sample_metadata_authority_deposit,
@@ -180,9 +195,7 @@ def sample_raw_extrinsic_metadata_objects(
 ):
     emd_ori1 = RawExtrinsicMetadata(
         target=graph_dataset.INITIAL_ORIGIN.swhid(),
-        discovery_date=datetime.datetime(
-            2015, 1, 1, 21, 0, 0, tzinfo=datetime.timezone.utc
-        ),
+        discovery_date=DISCOVERY_DATE_2015,
         authority=sample_metadata_authority_registry,
         fetcher=sample_metadata_fetcher,
         format="json",
@@ -190,9 +203,7 @@ def sample_raw_extrinsic_metadata_objects(
     )
     emd_ori2 = RawExtrinsicMetadata(
         target=graph_dataset.INITIAL_ORIGIN.swhid(),
-        discovery_date=datetime.datetime(
-            2016, 1, 1, 21, 0, 0, tzinfo=datetime.timezone.utc
-        ),
+        discovery_date=DISCOVERY_DATE_2016,
         authority=sample_metadata_authority_registry,
         fetcher=sample_metadata_fetcher,
         format="json",
@@ -200,9 +211,7 @@ def sample_raw_extrinsic_metadata_objects(
     )
     emd_ori3 = RawExtrinsicMetadata(
         target=graph_dataset.INITIAL_ORIGIN.swhid(),
-        discovery_date=datetime.datetime(
-            2016, 1, 1, 21, 0, 0, tzinfo=datetime.timezone.utc
-        ),
+        discovery_date=DISCOVERY_DATE_2016,
         authority=sample_metadata_authority_deposit,
         fetcher=sample_metadata_fetcher,
         format="json",
@@ -210,9 +219,7 @@ def sample_raw_extrinsic_metadata_objects(
     )
     emd_snp = RawExtrinsicMetadata(
         target=ExtendedSWHID(object_type=ExtendedObjectType.SNAPSHOT, object_id=h(20)),
-        discovery_date=datetime.datetime(
-            2015, 1, 1, 21, 0, 0, tzinfo=datetime.timezone.utc
-        ),
+        discovery_date=DISCOVERY_DATE_2015,
         authority=sample_metadata_authority_registry,
         fetcher=sample_metadata_fetcher,
         format="json",
@@ -220,9 +227,7 @@ def sample_raw_extrinsic_metadata_objects(
     )
     emd_rel = RawExtrinsicMetadata(
         target=ExtendedSWHID(object_type=ExtendedObjectType.RELEASE, object_id=h(10)),
-        discovery_date=datetime.datetime(
-            2015, 1, 1, 21, 0, 0, tzinfo=datetime.timezone.utc
-        ),
+        discovery_date=DISCOVERY_DATE_2015,
         authority=sample_metadata_authority_registry,
         fetcher=sample_metadata_fetcher,
         format="json",
@@ -230,9 +235,7 @@ def sample_raw_extrinsic_metadata_objects(
     )
     emd_rev = RawExtrinsicMetadata(
         target=ExtendedSWHID(object_type=ExtendedObjectType.REVISION, object_id=h(3)),
-        discovery_date=datetime.datetime(
-            2015, 1, 1, 21, 0, 0, tzinfo=datetime.timezone.utc
-        ),
+        discovery_date=DISCOVERY_DATE_2015,
         authority=sample_metadata_authority_registry,
         fetcher=sample_metadata_fetcher,
         format="json",
@@ -240,9 +243,7 @@ def sample_raw_extrinsic_metadata_objects(
     )
     emd_dir = RawExtrinsicMetadata(
         target=ExtendedSWHID(object_type=ExtendedObjectType.DIRECTORY, object_id=h(2)),
-        discovery_date=datetime.datetime(
-            2015, 1, 1, 21, 0, 0, tzinfo=datetime.timezone.utc
-        ),
+        discovery_date=DISCOVERY_DATE_2015,
         authority=sample_metadata_authority_registry,
         fetcher=sample_metadata_fetcher,
         format="json",
@@ -250,9 +251,7 @@ def sample_raw_extrinsic_metadata_objects(
     )
     emd_cnt = RawExtrinsicMetadata(
         target=ExtendedSWHID(object_type=ExtendedObjectType.CONTENT, object_id=h(1)),
-        discovery_date=datetime.datetime(
-            2015, 1, 1, 21, 0, 0, tzinfo=datetime.timezone.utc
-        ),
+        discovery_date=DISCOVERY_DATE_2015,
         authority=sample_metadata_authority_registry,
         fetcher=sample_metadata_fetcher,
         format="json",
@@ -267,9 +266,7 @@ def sample_raw_extrinsic_metadata_objects(
     )
     emd_emd = RawExtrinsicMetadata(
         target=emd_cnt.swhid(),
-        discovery_date=datetime.datetime(
-            2015, 1, 1, 21, 0, 0, tzinfo=datetime.timezone.utc
-        ),
+        discovery_date=DISCOVERY_DATE_2015,
         authority=sample_metadata_authority_deposit,
         fetcher=sample_metadata_fetcher,
         format="json",
@@ -277,9 +274,7 @@ def sample_raw_extrinsic_metadata_objects(
     )
     emd_emd_emd = RawExtrinsicMetadata(
         target=emd_emd.swhid(),
-        discovery_date=datetime.datetime(
-            2015, 1, 1, 21, 0, 0, tzinfo=datetime.timezone.utc
-        ),
+        discovery_date=DISCOVERY_DATE_2015,
         authority=sample_metadata_authority_deposit,
         fetcher=sample_metadata_fetcher,
         format="json",
@@ -299,28 +294,38 @@ def sample_raw_extrinsic_metadata_objects(
     ]
 
 
-def fix_contents(contents: Iterator[Content]) -> Iterator[Content]:
+def fix_contents(contents: Iterable[Content]) -> Iterator[Content]:
     """Recreate more complete Content objects using the same SWHIDs as the ones given.
 
     The content objects provided by :py:module:`swh.graph.example_dataset` are not
     complete enough to be inserted in a ``swh.storage``, so we make up what’s missing
     here."""
+    ctime = datetime.datetime.now(tz=datetime.timezone.utc)
     for content in contents:
-        swhid_value = int.from_bytes(content.swhid().object_id, "big")
-        yield Content.from_dict(
-            {
-                "sha1": bytes.fromhex(f"{swhid_value:040x}"),
-                "sha1_git": bytes.fromhex(f"{swhid_value:040x}"),
-                "sha256": bytes.fromhex(f"{swhid_value:064x}"),
-                "blake2s256": bytes.fromhex(f"{swhid_value:064x}"),
-                "data": bytes.fromhex(f"{swhid_value:02x}"),
-                "length": 1,
-                "ctime": datetime.datetime.now(tz=datetime.timezone.utc),
-            }
+        object_id = content.swhid().object_id
+        swhid_value = int.from_bytes(object_id, "big")
+        yield Content(
+            sha1=object_id,
+            sha1_git=object_id,
+            sha256=swhid_value.to_bytes(32, "big"),
+            blake2s256=swhid_value.to_bytes(32, "big"),
+            data=swhid_value.to_bytes(1, "big"),
+            length=1,
+            ctime=ctime,
         )
 
 
-@pytest.fixture
+EXAMPLE_CONTENTS = tuple(fix_contents(graph_dataset.CONTENTS))
+
+# swh.graph.example_dataset contains a dangling release which would
+# prevent us from removing any revisions, directories or contents in our tests.
+# We need to skip it.
+EXAMPLE_RELEASES_WITHOUT_DANGLING = tuple(
+    rel for rel in graph_dataset.RELEASES if rel.id != h(19)
+)
+
+
+@pytest.fixture(scope="module")
 def origin_with_submodule():
     # swh:1:ori:73186715131824fa4381c6b5ca041c1c90207ef0
     return Origin(url="https://example.com/swh/using-submodule")
@@ -348,58 +353,60 @@ def mocked_external_resources(
 # =============
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def empty_graph_client(naive_graph_client):
-    from swh.graph.http_naive_client import NaiveClient
-
     return NaiveClient(nodes=[], edges=[])
 
 
-@pytest.fixture
-def graph_client_with_only_initial_origin(naive_graph_client):
-    from swh.graph.http_naive_client import NaiveClient
+@pytest.fixture(scope="module")
+def example_origins_nodes_and_edges(naive_graph_client):
+    """Nodes and edges reachable from each origin of the example dataset,
+    keyed by origin SWHID, in the order the naive client visits them."""
+    return {
+        origin: (
+            tuple(naive_graph_client.visit_nodes(origin)),
+            tuple(naive_graph_client.visit_edges(origin)),
+        )
+        for origin in (
+            str(graph_dataset.INITIAL_ORIGIN.swhid()),
+            str(graph_dataset.FORKED_ORIGIN.swhid()),
+        )
+    }
 
-    initial_origin = str(graph_dataset.INITIAL_ORIGIN.swhid())
-    return NaiveClient(
-        nodes=list(naive_graph_client.visit_nodes(initial_origin)),
-        edges=list(naive_graph_client.visit_edges(initial_origin)),
-    )
 
+@pytest.fixture(scope="module")
+def graph_client_with_only_initial_origin(example_origins_nodes_and_edges):
+    initial_origin = str(graph_dataset.INITIAL_ORIGIN.swhid())
+    nodes, edges = example_origins_nodes_and_edges[initial_origin]
+    return NaiveClient(nodes=list(nodes), edges=list(edges))
 
-@pytest.fixture
-def graph_client_with_both_origins(naive_graph_client):
-    from swh.graph.http_naive_client import NaiveClient
 
+@pytest.fixture(scope="module")
+def graph_client_with_both_origins(example_origins_nodes_and_edges):
     # swh.graph.example_dataset contains a dangling release which would
     # prevent us from removing any revisions, directories or contents in our tests.
     # We skip it by reconstructing a graph from both origins
-    initial_origin = str(graph_dataset.INITIAL_ORIGIN.swhid())
-    forked_origin = str(graph_dataset.FORKED_ORIGIN.swhid())
-    nodes = set(naive_graph_client.visit_nodes(initial_origin)) | set(
-        naive_graph_client.visit_nodes(forked_origin)
-    )
-    edges = set(naive_graph_client.visit_edges(initial_origin)) | set(
-        naive_graph_client.visit_edges(forked_origin)
-    )
+    nodes: Set[str] = set()
+    edges: Set[Tuple[str, str]] = set()
+    for origin_nodes, origin_edges in example_origins_nodes_and_edges.values():
+        nodes.update(origin_nodes)
+        edges.update(origin_edges)
     return NaiveClient(nodes=nodes, edges=edges)
 
 
-@pytest.fixture
-def graph_client_with_submodule(naive_graph_client, origin_with_submodule):
-    from swh.graph.http_naive_client import NaiveClient
-
-    initial_origin = str(graph_dataset.INITIAL_ORIGIN.swhid())
-    forked_origin = str(graph_dataset.FORKED_ORIGIN.swhid())
-
-    extra_nodes = {
-        origin_with_submodule,
+# Nodes and edges added on top of the example dataset for the submodule
+# origin: its snapshot leads to a directory holding a revision of the forked
+# origin as a submodule.
+SUBMODULE_EXTRA_NODES = frozenset(
+    {
         "swh:1:snp:0000000000000000000000000000000000000032",
         "swh:1:rev:0000000000000000000000000000000000000031",
         "swh:1:rev:0000000000000000000000000000000000000013",
         "swh:1:dir:0000000000000000000000000000000000000030",
     }
-    extra_edges = {
-        (origin_with_submodule, "swh:1:snp:0000000000000000000000000000000000000032"),
+)
+SUBMODULE_EXTRA_EDGES = frozenset(
+    {
         (
             "swh:1:snp:0000000000000000000000000000000000000032",
             "swh:1:rev:0000000000000000000000000000000000000031",
@@ -413,16 +420,20 @@ def graph_client_with_submodule(naive_graph_client, origin_with_submodule):
             "swh:1:rev:0000000000000000000000000000000000000013",
         ),
     }
-    nodes = (
-        set(naive_graph_client.visit_nodes(initial_origin))
-        | set(naive_graph_client.visit_nodes(forked_origin))
-        | extra_nodes
-    )
-    edges = (
-        set(naive_graph_client.visit_edges(initial_origin))
-        | set(naive_graph_client.visit_edges(forked_origin))
-        | extra_edges
+)
+
+
+@pytest.fixture(scope="module")
+def graph_client_with_submodule(example_origins_nodes_and_edges, origin_with_submodule):
+    nodes = set(SUBMODULE_EXTRA_NODES)
+    nodes.add(origin_with_submodule)
+    edges = set(SUBMODULE_EXTRA_EDGES)
+    edges.add(
+        (origin_with_submodule, "swh:1:snp:0000000000000000000000000000000000000032")
     )
+    for origin_nodes, origin_edges in example_origins_nodes_and_edges.values():
+        nodes.update(origin_nodes)
+        edges.update(origin_edges)
     return NaiveClient(nodes=nodes, edges=edges)
 
 
@@ -453,22 +464,13 @@ def sample_populated_storage(
     sample_metadata_fetcher,
     sample_raw_extrinsic_metadata_objects,
 ):
-    swh_storage.content_add(fix_contents(graph_dataset.CONTENTS))
+    swh_storage.content_add(EXAMPLE_CONTENTS)
     swh_storage.skipped_content_add(graph_dataset.SKIPPED_CONTENTS)
     directories = list(graph_dataset.DIRECTORIES)
     directories[1] = directory_6_with_multiple_entries_pointing_to_the_same_content
     swh_storage.directory_add(directories)
     swh_storage.revision_add(graph_dataset.REVISIONS)
-    # swh.graph.example_dataset contains a dangling release which would
-    # prevent us from removing any revisions, directories or contents in our tests.
-    # We need to skip it.
-    swh_storage.release_add(
-        [
-            rel
-            for rel in graph_dataset.RELEASES
-            if str(rel.swhid()) != "swh:1:rel:0000000000000000000000000000000000000019"
-        ]
-    )
+    swh_storage.release_add(EXAMPLE_RELEASES_WITHOUT_DANGLING)
     snapshot_22 = graph_dataset.SNAPSHOTS[1]
     swh_storage.snapshot_add(
         [snapshot_20_with_multiple_branches_pointing_to_the_same_head, snapshot_22]
@@ -608,33 +610,33 @@ def empty_subgraph():
     return Subgraph()
 
 
-@pytest.fixture
-def sample_data_subgraph(empty_subgraph):
-    g = empty_subgraph
+@lru_cache(maxsize=None)
+def build_sample_data_subgraph() -> Subgraph:
+    # Collect vertices and edges first to add them to the graph in two calls
+    vertices: Dict[str, None] = {}
+    edges: List[Tuple[str, str]] = []
+
+    def add_object(source, targets=()):
+        vertices[str(source)] = None
+        for target in targets:
+            vertices[str(target)] = None
+            edges.append((str(source), str(target)))
+
     for content in graph_dataset.CONTENTS:
-        g.add_swhid(content)
+        add_object(content.swhid())
     for skipped_content in graph_dataset.SKIPPED_CONTENTS:
-        g.add_swhid(skipped_content)
+        add_object(skipped_content.swhid())
     for directory in graph_dataset.DIRECTORIES:
-        source = g.add_swhid(directory)
-        targets = [g.add_swhid(entry) for entry in directory.entries]
-        g.add_edges([(source, target) for target in targets])
+        add_object(directory.swhid(), [entry.swhid() for entry in directory.entries])
     for revision in graph_dataset.REVISIONS:
-        source = g.add_swhid(revision)
-        targets = []
-        targets.append(g.add_swhid(revision.directory_swhid()))
-        for parent_swhid in revision.parent_swhids():
-            targets.append(g.add_swhid(parent_swhid))
-        g.add_edges([(source, target) for target in targets])
-    for release in graph_dataset.RELEASES:
-        if str(release.swhid()) == "swh:1:rel:0000000000000000000000000000000000000019":
-            # Skip the dangling swh:rel:…019 (not connected to any origin)
-            continue
-        source = g.add_swhid(release)
-        target = g.add_swhid(release.target_swhid())
-        g.add_edges([(source, target)])
+        add_object(
+            revision.swhid(),
+            [revision.directory_swhid(), *revision.parent_swhids()],
+        )
+    # Skip the dangling swh:rel:…019 (not connected to any origin)
+    for release in EXAMPLE_RELEASES_WITHOUT_DANGLING:
+        add_object(release.swhid(), [release.target_swhid()])
     for snapshot in graph_dataset.SNAPSHOTS:
-        source = g.add_swhid(snapshot)
         targets = []
         for branch in snapshot.branches.values():
             if not branch:  # skip dangling branches
@@ -642,76 +644,118 @@ def sample_data_subgraph(empty_subgraph):
             target_swhid = branch.swhid()
             if target_swhid is None:
                 continue
-            targets.append(g.add_swhid(target_swhid))
-        g.add_edges([(source, target) for target in targets])
+            targets.append(target_swhid)
+        add_object(snapshot.swhid(), targets)
     for origin in graph_dataset.ORIGINS:
-        source = g.add_swhid(origin)
+        add_object(origin.swhid())
     for visit_status in graph_dataset.ORIGIN_VISIT_STATUSES:
         if visit_status.snapshot is None:
             continue
-        source = g.add_swhid(visit_status.origin_swhid())
-        target = g.add_swhid(visit_status.snapshot_swhid())
-        g.add_edges([(source, target)])
+        add_object(visit_status.origin_swhid(), [visit_status.snapshot_swhid()])
+    g = Subgraph()
+    g.add_swhids(vertices)
+    g.add_edges(edges)
     write_dot_if_requested(g, "sample_data_subgraph.dot")
     return g
 
 
+@pytest.fixture
+def sample_data_subgraph():
+    # Tests are free to modify the subgraph: give them their own copy
+    return Subgraph.copy(build_sample_data_subgraph())
+
+
 #
 # InventorySubgraphs
 # ==================
 
 
-@pytest.fixture
-def inventory_from_forked_origin():
+@lru_cache(maxsize=None)
+def build_inventory_from_forked_origin() -> InventorySubgraph:
+    v_ori = str(graph_dataset.FORKED_ORIGIN.swhid())
+    v_snp = "swh:1:snp:0000000000000000000000000000000000000022"
+    v_rel_21 = "swh:1:rel:0000000000000000000000000000000000000021"
+    v_rel_10 = "swh:1:rel:0000000000000000000000000000000000000010"
+    v_rev_18 = "swh:1:rev:0000000000000000000000000000000000000018"
+    v_rev_13 = "swh:1:rev:0000000000000000000000000000000000000013"
+    v_rev_09 = "swh:1:rev:0000000000000000000000000000000000000009"
+    v_rev_03 = "swh:1:rev:0000000000000000000000000000000000000003"
+    v_dir_17 = "swh:1:dir:0000000000000000000000000000000000000017"
+    v_dir_16 = "swh:1:dir:0000000000000000000000000000000000000016"
+    v_dir_12 = "swh:1:dir:0000000000000000000000000000000000000012"
+    v_dir_08 = "swh:1:dir:0000000000000000000000000000000000000008"
+    v_dir_06 = "swh:1:dir:0000000000000000000000000000000000000006"
+    v_dir_02 = "swh:1:dir:0000000000000000000000000000000000000002"
+    v_cnt_15 = "swh:1:cnt:0000000000000000000000000000000000000015"
+    v_cnt_14 = "swh:1:cnt:0000000000000000000000000000000000000014"
+    v_cnt_11 = "swh:1:cnt:0000000000000000000000000000000000000011"
+    v_cnt_07 = "swh:1:cnt:0000000000000000000000000000000000000007"
+    v_cnt_05 = "swh:1:cnt:0000000000000000000000000000000000000005"
+    v_cnt_04 = "swh:1:cnt:0000000000000000000000000000000000000004"
+    v_cnt_01 = "swh:1:cnt:0000000000000000000000000000000000000001"
     g = InventorySubgraph()
-    v_ori = g.add_swhid(graph_dataset.FORKED_ORIGIN.swhid())
-    v_snp = g.add_swhid("swh:1:snp:0000000000000000000000000000000000000022")
-    v_rel_21 = g.add_swhid("swh:1:rel:0000000000000000000000000000000000000021")
-    v_rel_10 = g.add_swhid("swh:1:rel:0000000000000000000000000000000000000010")
-    v_rev_18 = g.add_swhid("swh:1:rev:0000000000000000000000000000000000000018")
-    v_rev_13 = g.add_swhid("swh:1:rev:0000000000000000000000000000000000000013")
-    v_rev_09 = g.add_swhid("swh:1:rev:0000000000000000000000000000000000000009")
-    v_rev_03 = g.add_swhid("swh:1:rev:0000000000000000000000000000000000000003")
-    v_dir_17 = g.add_swhid("swh:1:dir:0000000000000000000000000000000000000017")
-    v_dir_16 = g.add_swhid("swh:1:dir:0000000000000000000000000000000000000016")
-    v_dir_12 = g.add_swhid("swh:1:dir:0000000000000000000000000000000000000012")
-    v_dir_08 = g.add_swhid("swh:1:dir:0000000000000000000000000000000000000008")
-    v_dir_06 = g.add_swhid("swh:1:dir:0000000000000000000000000000000000000006")
-    v_dir_02 = g.add_swhid("swh:1:dir:0000000000000000000000000000000000000002")
-    v_cnt_15 = g.add_swhid("swh:1:cnt:0000000000000000000000000000000000000015")
-    v_cnt_14 = g.add_swhid("swh:1:cnt:0000000000000000000000000000000000000014")
-    v_cnt_11 = g.add_swhid("swh:1:cnt:0000000000000000000000000000000000000011")
-    v_cnt_07 = g.add_swhid("swh:1:cnt:0000000000000000000000000000000000000007")
-    v_cnt_05 = g.add_swhid("swh:1:cnt:0000000000000000000000000000000000000005")
-    v_cnt_04 = g.add_swhid("swh:1:cnt:0000000000000000000000000000000000000004")
-    v_cnt_01 = g.add_swhid("swh:1:cnt:0000000000000000000000000000000000000001")
-    g.add_edge(v_ori, v_snp)
-    g.add_edge(v_snp, v_rel_21)
-    g.add_edge(v_snp, v_rel_10)
-    g.add_edge(v_snp, v_rev_09)
-    g.add_edge(v_rel_21, v_rev_18)
-    g.add_edge(v_rev_18, v_rev_13)
-    g.add_edge(v_rev_13, v_rev_09)
-    g.add_edge(v_rev_09, v_rev_03)
-    g.add_edge(v_rev_18, v_dir_17)
-    g.add_edge(v_rev_13, v_dir_12)
-    g.add_edge(v_rev_09, v_dir_08)
-    g.add_edge(v_rev_03, v_dir_02)
-    g.add_edge(v_dir_17, v_dir_16)
-    g.add_edge(v_dir_12, v_dir_08)
-    g.add_edge(v_dir_08, v_dir_06)
-    g.add_edge(v_dir_17, v_cnt_14)
-    g.add_edge(v_dir_16, v_cnt_15)
-    g.add_edge(v_dir_12, v_cnt_11)
-    g.add_edge(v_dir_08, v_cnt_07)
-    g.add_edge(v_dir_08, v_cnt_01)
-    g.add_edge(v_dir_06, v_cnt_05)
-    g.add_edge(v_dir_06, v_cnt_04)
-    g.add_edge(v_dir_02, v_cnt_01)
+    g.add_swhids(
+        [
+            v_ori,
+            v_snp,
+            v_rel_21,
+            v_rel_10,
+            v_rev_18,
+            v_rev_13,
+            v_rev_09,
+            v_rev_03,
+            v_dir_17,
+            v_dir_16,
+            v_dir_12,
+            v_dir_08,
+            v_dir_06,
+            v_dir_02,
+            v_cnt_15,
+            v_cnt_14,
+            v_cnt_11,
+            v_cnt_07,
+            v_cnt_05,
+            v_cnt_04,
+            v_cnt_01,
+        ]
+    )
+    g.add_edges(
+        [
+            (v_ori, v_snp),
+            (v_snp, v_rel_21),
+            (v_snp, v_rel_10),
+            (v_snp, v_rev_09),
+            (v_rel_21, v_rev_18),
+            (v_rev_18, v_rev_13),
+            (v_rev_13, v_rev_09),
+            (v_rev_09, v_rev_03),
+            (v_rev_18, v_dir_17),
+            (v_rev_13, v_dir_12),
+            (v_rev_09, v_dir_08),
+            (v_rev_03, v_dir_02),
+            (v_dir_17, v_dir_16),
+            (v_dir_12, v_dir_08),
+            (v_dir_08, v_dir_06),
+            (v_dir_17, v_cnt_14),
+            (v_dir_16, v_cnt_15),
+            (v_dir_12, v_cnt_11),
+            (v_dir_08, v_cnt_07),
+            (v_dir_08, v_cnt_01),
+            (v_dir_06, v_cnt_05),
+            (v_dir_06, v_cnt_04),
+            (v_dir_02, v_cnt_01),
+        ]
+    )
     write_dot_if_requested(g, "inventory_from_forked_origin.dot")
     return g
 
 
+@pytest.fixture
+def inventory_from_forked_origin():
+    # Tests are free to modify the inventory: give them their own copy
+    return InventorySubgraph.copy(build_inventory_from_forked_origin())
+
+
 #
 # Recovery bundles
 # ================
@@ -761,7 +805,24 @@ secret_sharing:
 """
 
 
-@pytest.fixture(params=["version-1", "version-2", "version-3"])
+@lru_cache(maxsize=None)
+def _parse_two_groups_required_with_one_minimum_share_each_secret_sharing_yaml():
+    return yaml.safe_load(
+        TWO_GROUPS_REQUIRED_WITH_ONE_MINIMUM_SHARE_EACH_SECRET_SHARING_YAML
+    )
+
+
+def two_groups_required_with_one_minimum_share_each_secret_sharing() -> Dict[str, Any]:
+    """Parsed version of
+    :py:data:`TWO_GROUPS_REQUIRED_WITH_ONE_MINIMUM_SHARE_EACH_SECRET_SHARING_YAML`.
+
+    The YAML is only parsed once. Callers get their own copy, free to modify."""
+    return copy.deepcopy(
+        _parse_two_groups_required_with_one_minimum_share_each_secret_sharing_yaml()
+    )
+
+
+@pytest.fixture(scope="module", params=["version-1", "version-2", "version-3"])
 def sample_recovery_bundle_path(request):
     return os.path.join(
         os.path.dirname(__file__),
@@ -774,8 +835,9 @@ def object_decryption_key_provider_for_sample(manifest: Manifest) -> AgeSecretKe
     return OBJECT_SECRET_KEY
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_recovery_bundle(sample_recovery_bundle_path):
+    # Tests only read from the sample bundles: open each of them once
     return RecoveryBundle(
         sample_recovery_bundle_path, object_decryption_key_provider_for_sample
     )
@@ -11,6 +11,7 @@ import shutil
 import socket
 import sys
 import textwrap
+import time
 
 from click.testing import CliRunner
 import pytest
@@ -33,10 +34,15 @@ from ..cli import (
 )
 from ..inventory import RootsNotFound, StuckInventoryException
 from ..operations import MaskingRequestNotFound, Removable, Remover, RemoverError
-from ..recovery_bundle import AgeSecretKey, ContentDataNotFound, age_decrypt
+from ..recovery_bundle import (
+    AgeSecretKey,
+    ContentDataNotFound,
+    WrongDecryptionKey,
+    age_decrypt,
+)
 from .conftest import (
     OBJECT_SECRET_KEY,
-    TWO_GROUPS_REQUIRED_WITH_ONE_MINIMUM_SHARE_EACH_SECRET_SHARING_YAML,
+    two_groups_required_with_one_minimum_share_each_secret_sharing,
 )
 
 DEFAULT_CONFIG = {
@@ -76,6 +82,55 @@ def isolate_loggers():
         logger.propagate = True
 
 
+def test_buffering_click_logging_handler(capsys):
+    from ..cli import BufferingClickLoggingHandler
+
+    handler = BufferingClickLoggingHandler()
+    logger = logging.getLogger("swh.alter.tests.buffering")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    try:
+        logger.info("one")
+        logger.info("two", extra={"style": {"fg": "green"}})
+        logger.info("three", extra={"style": {"err": True}})
+        assert capsys.readouterr() == ("", "")
+        handler.flush()
+        assert capsys.readouterr() == ("one\ntwo\n", "three\n")
+        logger.error("failed", extra={"style": {"err": True}})
+        assert capsys.readouterr() == ("", "failed\n")
+    finally:
+        logger.removeHandler(handler)
+
+
+def test_queued_logging_clears_progressbar_line(capsys, monkeypatch):
+    from ..cli import ClickLoggingHandler, progressbar, queued_logging
+
+    monkeypatch.setattr(sys.stderr, "isatty", lambda: True)
+    logger = logging.getLogger("swh.alter.operations")
+    saved = (logger.propagate, logger.handlers, logger.level)
+    logger.propagate = False
+    logger.handlers = [ClickLoggingHandler()]
+    logger.setLevel(logging.INFO)
+    try:
+        with queued_logging():
+            with progressbar(length=2, label="Working…") as bar:
+                bar.update(1)
+                logger.warning("retrying")
+                # Records are written while the bar is still displayed
+                deadline = time.monotonic() + 5
+                out = ""
+                while not out and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                    out, err = capsys.readouterr()
+                assert out == "retrying\n"
+                # … after clearing the line of the bar
+                assert err.endswith("\r\033[K")
+                bar.update(1)
+    finally:
+        logger.propagate, logger.handlers, logger.level = saved
+
+
 @pytest.fixture
 def remove_config():
     config = dict(DEFAULT_CONFIG)
@@ -111,8 +166,8 @@ def remove_config():
             "client_id": "swh.alter.removals",
         },
     }
-    config["recovery_bundles"] = yaml.safe_load(
-        TWO_GROUPS_REQUIRED_WITH_ONE_MINIMUM_SHARE_EACH_SECRET_SHARING_YAML
+    config["recovery_bundles"] = (
+        two_groups_required_with_one_minimum_share_each_secret_sharing()
     )
     return config
 
@@ -2059,6 +2114,28 @@ def fake_age_decrypt(secret_key, ciphertext):
         return _original_age_decrypt(secret_key, ciphertext)
 
 
+@pytest.mark.parametrize(
+    "output,expected",
+    [
+        (b"", b""),
+        (b"error: no identity", b"error: no identity"),
+        (
+            b"error: no identity\n"
+            b"\n"
+            b"[ Did rage not do what you expected? Could an error be more useful? ]\n"
+            b"[ Tell us: https://str4d.xyz/rage/report                            ]",
+            b"error: no identity\n",
+        ),
+        (b"[ report ]\nfirst\nsecond\n[ report ]\n", b"first\nsecond\n"),
+        (b"[ report ]", b""),
+    ],
+)
+def test_strip_rage_report(output, expected):
+    from ..cli import _strip_rage_report
+
+    assert _strip_rage_report(output) == expected
+
+
 def test_cli_recovery_bundle_recover_decryption_key_from_yubikeys(
     env_with_deactivated_age_yubikey_plugin_in_path,
     mocker,
@@ -2083,6 +2160,26 @@ def test_cli_recovery_bundle_recover_decryption_key_from_yubikeys(
     assert DECRYPTION_KEY_FOR_RECOVERY_TESTS in result.output
 
 
+def test_list_yubikey_identities_is_kept_for_the_invocation(mocker):
+    import click
+
+    from ..cli import _list_yubikey_identities
+
+    list_yubikey_identities = mocker.patch(
+        "swh.alter.recovery_bundle.list_yubikey_identities",
+        wraps=fake_list_yubikey_identities,
+    )
+    with click.Context(click.Command("test")):
+        assert _list_yubikey_identities() == fake_list_yubikey_identities()
+        assert _list_yubikey_identities() == fake_list_yubikey_identities()
+        assert list_yubikey_identities.call_count == 1
+        _list_yubikey_identities(refresh=True)
+        assert list_yubikey_identities.call_count == 2
+    with click.Context(click.Command("test")):
+        _list_yubikey_identities()
+        assert list_yubikey_identities.call_count == 3
+
+
 @pytest.fixture
 def alabaster_identity_file_path(tmp_path):
     identity_file = tmp_path / "age-identity-alabaster.txt"
@@ -2133,6 +2230,93 @@ def test_cli_recovery_bundle_recover_decryption_key_from_identity_files(
     assert DECRYPTION_KEY_FOR_RECOVERY_TESTS in result.output
 
 
+def test_recover_mnemonics_from_identity_files_tries_interactive_ones_sequentially(
+    mocker, tmp_path, alabaster_identity_file_path
+):
+    import threading
+
+    from ..cli import _recover_mnemonics_from_identity_files
+
+    yubikey_identity_file_path = tmp_path / "age-yubikey-identity.txt"
+    yubikey_identity_file_path.write_text("AGE-PLUGIN-YUBIKEY-1ABCDEF\n")
+    manifest = mocker.Mock()
+    manifest.decryption_key_shares = {
+        "Alabaster": "alabaster-share",
+        "Essun": "essun-share",
+        "Innon": "innon-share",
+    }
+    lock = threading.Lock()
+    in_flight = []
+    interactive_calls = []
+
+    def fake_age_decrypt_from_identity(identity_file, ciphertext):
+        with lock:
+            in_flight.append(identity_file)
+            if identity_file == str(yubikey_identity_file_path):
+                # Interactive identities must never be used concurrently
+                assert in_flight == [identity_file]
+                interactive_calls.append(ciphertext)
+        try:
+            if identity_file == alabaster_identity_file_path:
+                if ciphertext == "alabaster-share":
+                    return b"alabaster mnemonic"
+            elif ciphertext == "essun-share":
+                return b"essun mnemonic"
+            raise WrongDecryptionKey()
+        finally:
+            with lock:
+                in_flight.remove(identity_file)
+
+    mocker.patch(
+        "swh.alter.recovery_bundle.age_decrypt_from_identity",
+        side_effect=fake_age_decrypt_from_identity,
+    )
+    recovered = _recover_mnemonics_from_identity_files(
+        manifest,
+        set(manifest.decryption_key_shares.keys()),
+        [str(yubikey_identity_file_path), alabaster_identity_file_path],
+        False,
+    )
+    assert recovered == {
+        "Alabaster": "alabaster mnemonic",
+        "Essun": "essun mnemonic",
+    }
+    # The share already decrypted from the plain identity file is not retried
+    assert sorted(interactive_calls) == ["essun-share", "innon-share"]
+
+
+def test_recover_mnemonics_from_identity_files_stops_on_error(
+    mocker, alabaster_identity_file_path, essun_identity_file_path
+):
+    from ..cli import _recover_mnemonics_from_identity_files
+
+    manifest = mocker.Mock()
+    manifest.decryption_key_shares = {
+        f"share-{i}": f"ciphertext-{i}" for i in range(64)
+    }
+
+    def fake_age_decrypt_from_identity(identity_file, ciphertext):
+        if ciphertext == "ciphertext-0":
+            raise OSError("rage exploded")
+        # Other attempts take a while, so most are still queued on error
+        time.sleep(0.05)
+        raise WrongDecryptionKey()
+
+    age_decrypt_from_identity = mocker.patch(
+        "swh.alter.recovery_bundle.age_decrypt_from_identity",
+        side_effect=fake_age_decrypt_from_identity,
+    )
+    with pytest.raises(OSError, match="rage exploded"):
+        _recover_mnemonics_from_identity_files(
+            manifest,
+            sorted(manifest.decryption_key_shares.keys()),
+            [alabaster_identity_file_path, essun_identity_file_path],
+            False,
+        )
+    # Attempts still waiting in the queue have been cancelled
+    assert age_decrypt_from_identity.call_count < 2 * 64
+
+
 def test_cli_recovery_bundle_recover_decryption_key_from_secrets(
     env_with_deactivated_age_yubikey_plugin_in_path,
     decryption_key_recovery_tests_bundle_path,
@@ -2349,6 +2533,110 @@ def test_cli_recovery_bundle_rollover_with_identity_files(
     assert bundle2.share_ids == {"Ali", "Bob", "Camille", "Dlique"}
 
 
+def test_cli_recovery_bundle_rollover_reports_every_bundle(
+    mocker,
+    tmp_path,
+    sample_recovery_bundle_path,
+    remove_config,
+    rollover_input_proceed_with_rollover,
+):
+    from ..recovery_bundle import RecoveryBundle
+
+    bundle1_path = shutil.copy(
+        sample_recovery_bundle_path, tmp_path / "rollover1.swh-recovery-bundle"
+    )
+    bundle2_path = shutil.copy(
+        sample_recovery_bundle_path, tmp_path / "rollover2.swh-recovery-bundle"
+    )
+    original_rollover = RecoveryBundle.rollover
+
+    def failing_rollover(self, secret_sharing):
+        if os.path.basename(self._zip.filename) == bundle1_path.name:
+            raise OSError("No space left on device")
+        return original_rollover(self, secret_sharing)
+
+    mocker.patch.object(RecoveryBundle, "rollover", failing_rollover)
+    runner = CliRunner()
+    result = runner.invoke(
+        rollover,
+        [
+            f"--decryption-key={OBJECT_SECRET_KEY}",
+            str(bundle1_path),
+            str(bundle2_path),
+            # Given twice, but must only be rolled over once
+            str(bundle2_path),
+        ],
+        obj={"config": remove_config},
+        input=rollover_input_proceed_with_rollover,
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 1
+    assert (
+        "Unable to roll over shared secrets for test_bundle: No space left on device"
+        in result.stderr
+    )
+    assert result.stdout.count("have been rolled over") == 1
+    assert RecoveryBundle(bundle2_path).share_ids == {"Ali", "Bob", "Camille", "Dlique"}
+
+
+def test_cli_recovery_bundle_rollover_partial_failure(
+    mocker,
+    tmp_path,
+    sample_recovery_bundle_path,
+    remove_config,
+    rollover_input_proceed_with_rollover,
+):
+    from ..recovery_bundle import RecoveryBundle
+
+    bundle_paths = [
+        shutil.copy(
+            sample_recovery_bundle_path, tmp_path / f"{name}.swh-recovery-bundle"
+        )
+        for name in ("first", "second", "third")
+    ]
+
+    def bundle_name(self):
+        return os.path.basename(self._zip.filename).split(".")[0]
+
+    def rollover_failing_for_second(self, secret_sharing):
+        if bundle_name(self) == "second":
+            raise OSError("No space left on device")
+
+    # Neither decryption nor encryption happen, so `rage` is not needed
+    mocker.patch.object(
+        RecoveryBundle, "origins", return_value=[mocker.sentinel.origin]
+    )
+    mocker.patch.object(RecoveryBundle, "removal_identifier", new=property(bundle_name))
+    rollover_mock = mocker.patch.object(
+        RecoveryBundle,
+        "rollover",
+        autospec=True,
+        side_effect=rollover_failing_for_second,
+    )
+    runner = CliRunner()
+    result = runner.invoke(
+        rollover,
+        [f"--decryption-key={OBJECT_SECRET_KEY}", *map(str, bundle_paths)],
+        obj={"config": remove_config},
+        input=rollover_input_proceed_with_rollover,
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 1
+    assert rollover_mock.call_count == 3
+    outcomes = [
+        line
+        for line in result.output.splitlines()
+        if "rolled over" in line or "roll over" in line
+    ]
+    assert outcomes == [
+        "Shared secrets for first have been rolled over.",
+        "Unable to roll over shared secrets for second: No space left on device",
+        "Shared secrets for third have been rolled over.",
+    ]
+    assert outcomes[1] in result.stderr
+    assert "second" not in result.stdout
+
+
 def test_cli_recovery_bundle_rollover_can_be_canceled(
     tmp_path, sample_recovery_bundle_path, remove_config
 ):
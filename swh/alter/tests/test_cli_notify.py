@@ -1,13 +1,12 @@
 from click.testing import CliRunner
 import pytest
-import yaml
 
 from swh.alter.cli import list_candidates, remove
 from swh.alter.notifications import RemovalNotification
 
 from .test_cli import (
     DEFAULT_CONFIG,
-    TWO_GROUPS_REQUIRED_WITH_ONE_MINIMUM_SHARE_EACH_SECRET_SHARING_YAML,
+    two_groups_required_with_one_minimum_share_each_secret_sharing,
 )
 
 
@@ -47,8 +46,8 @@ def remove_config(kafka_server, kafka_prefix):
             "client_id": "swh.alter.removals",
         },
     }
-    config["recovery_bundles"] = yaml.safe_load(
-        TWO_GROUPS_REQUIRED_WITH_ONE_MINIMUM_SHARE_EACH_SECRET_SHARING_YAML
+    config["recovery_bundles"] = (
+        two_groups_required_with_one_minimum_share_each_secret_sharing()
     )
     config["journal_writer"] = {
         "cls": "memory",
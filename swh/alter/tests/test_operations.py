@@ -14,7 +14,6 @@ from typing import Any, List, Set
 from unittest.mock import call
 
 import pytest
-import yaml
 
 from swh.model.model import BaseModel, Origin
 from swh.model.swhids import CoreSWHID, ExtendedObjectType, ExtendedSWHID
@@ -28,7 +27,7 @@ from ..operations import MaskingRequestNotFound, Removable, Remover, RemoverErro
 from ..recovery_bundle import SecretSharing
 from .conftest import (
     OBJECT_SECRET_KEY,
-    TWO_GROUPS_REQUIRED_WITH_ONE_MINIMUM_SHARE_EACH_SECRET_SHARING_YAML,
+    two_groups_required_with_one_minimum_share_each_secret_sharing,
 )
 
 
@@ -162,9 +161,9 @@ def test_remover_output_pruned_removable_subgraph(tmp_path, remover):
 
 @pytest.fixture
 def secret_sharing_conf():
-    return yaml.safe_load(
-        TWO_GROUPS_REQUIRED_WITH_ONE_MINIMUM_SHARE_EACH_SECRET_SHARING_YAML
-    )["secret_sharing"]
+    return two_groups_required_with_one_minimum_share_each_secret_sharing()[
+        "secret_sharing"
+    ]
 
 
 def test_remover_create_recovery_bundle(
@@ -481,6 +480,8 @@ def test_remover_remove_from_objstorage_display_timings(
         ],
         algo="sha1_git",
     )
+    # Run deletions one after the other for timings to be predictable
+    mocker.patch("swh.alter.operations.OBJSTORAGE_DELETE_MAX_WORKERS", 1)
     mocker.patch("time.monotonic", side_effect=[0.001, 0.2, 0.3, 0.4, 0.5, 0.72])
     remover.objids_to_remove = [
         objid_from_dict(content.to_dict()) for content in contents
@@ -514,13 +515,56 @@ def test_remover_remove_from_searches(
     ]
     remover.remove()
     for search in (search1, search2):
-        assert search.origin_delete.call_args_list == [
+        # Deletions are sent concurrently, in no particular order
+        assert sorted(search.origin_delete.call_args_list) == [
             call("https://example.com/swh/graph1"),
             call("https://example.com/swh/graph2"),
         ]
         search.flush.assert_called_once()
 
 
+def test_remover_remove_from_search_stops_on_failure(
+    mocker,
+    sample_populated_storage,
+):
+    search = mocker.Mock(spec=SearchInterface)
+    search.origin_delete.side_effect = ConnectionError("search is down")
+    remover = Remover(
+        sample_populated_storage,
+        mocker.MagicMock(),
+        removal_searches={"one": search},
+    )
+    remover.origin_urls_to_remove = [
+        f"https://example.com/swh/graph{i}" for i in range(1000)
+    ]
+    with pytest.raises(ConnectionError, match="search is down"):
+        remover.remove_from_search("one", search)
+    # Deletions waiting in the queue have not been sent
+    assert search.origin_delete.call_count < 1000
+    # … but the ones made so far are flushed
+    search.flush.assert_called_once()
+
+
+def test_map_in_flight_bounds_submitted_calls():
+    from concurrent.futures import ThreadPoolExecutor
+
+    from ..operations import _map_in_flight
+
+    consumed = []
+
+    def items():
+        for i in range(100):
+            consumed.append(i)
+            yield i
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = _map_in_flight(executor, lambda i: i * 2, items(), 4)
+        assert next(results) == 0
+        # Only the calls within the window have been submitted
+        assert len(consumed) == 4
+        assert list(results) == [i * 2 for i in range(1, 100)]
+
+
 def test_remover_have_new_references_outside_removed(
     mocker,
     sample_populated_storage,
@@ -589,6 +633,15 @@ def test_remover_have_new_references_inside_removed(
         [ExtendedSWHID.from_string(swhid) for swhid in swhids]
     )
     assert result is False
+    # Origins cannot be referenced, so they are not looked up
+    looked_up = {
+        c.args[0] for c in storage.object_find_recent_references.call_args_list
+    }
+    assert looked_up == {
+        ExtendedSWHID.from_string(swhid)
+        for swhid in swhids
+        if not swhid.startswith("swh:1:ori:")
+    }
 
 
 def test_remover_have_new_references_nothing_new(
@@ -0,0 +1,58 @@
+# Copyright (C) 2024 The Software Heritage developers
+# See the AUTHORS file at the top-level directory of this distribution
+# License: GNU General Public License version 3, or any later version
+# See top-level LICENSE file for more information
+
+from unittest.mock import MagicMock, call
+
+import pytest
+
+from ..progressbar import ThrottledProgressBar, no_progressbar
+
+
+def test_no_progressbar_iterable():
+    with no_progressbar(["a", "b", "c"]) as bar:
+        assert next(bar) == "a"
+        assert list(bar) == ["b", "c"]
+
+
+def test_no_progressbar_length():
+    with no_progressbar(length=3) as bar:
+        assert next(bar) == 0
+        bar.update(1)
+        assert list(bar) == [1, 2]
+
+
+def test_no_progressbar_logs_label(caplog):
+    with caplog.at_level("INFO", logger="swh.alter.progressbar"):
+        no_progressbar([], label="Doing things…")
+    assert caplog.messages == ["Doing things…"]
+
+
+def test_no_progressbar_requires_iterable_or_length():
+    with pytest.raises(ValueError):
+        no_progressbar()
+
+
+def test_throttled_progressbar_accumulates_updates(mocker):
+    monotonic = mocker.patch("swh.alter.progressbar.time.monotonic", return_value=0.0)
+    bar = MagicMock()
+    with ThrottledProgressBar(bar, interval=1.0) as throttled:
+        throttled.update(1)
+        throttled.update(1)
+        throttled.update(2, current_item="c")
+        monotonic.return_value = 1.5
+        throttled.update(1)
+        throttled.update(3)
+    assert bar.update.call_args_list == [
+        call(1, current_item=None),
+        call(4, current_item="c"),
+        call(3, current_item=None),
+    ]
+    bar.__exit__.assert_called_once()
+
+
+def test_throttled_progressbar_iterates_wrapped_bar():
+    with ThrottledProgressBar(no_progressbar(["a", "b", "c"])) as throttled:
+        assert next(throttled) == "a"
+        assert list(throttled) == ["b", "c"]
@@ -8,11 +8,13 @@ import itertools
 import logging
 import os
 import shutil
+from zipfile import ZipFile
 
 import attr
 import pytest
 import yaml
 
+from swh.journal.serializers import kafka_to_value
 from swh.model.model import Content, Origin
 from swh.model.swhids import ExtendedSWHID
 
@@ -44,13 +46,13 @@ from .conftest import (
     ESSUN_SECRET_KEY,
     OBJECT_PUBLIC_KEY,
     OBJECT_SECRET_KEY,
-    TWO_GROUPS_REQUIRED_WITH_ONE_MINIMUM_SHARE_EACH_SECRET_SHARING_YAML,
     object_decryption_key_provider_for_sample,
+    two_groups_required_with_one_minimum_share_each_secret_sharing,
 )
 
 
-@pytest.fixture
-def manifest_dict():
+@pytest.fixture(scope="module")
+def manifest_dict_template():
     return {
         "version": 3,
         "removal_identifier": "TDN-2023-06-18-01",
@@ -118,18 +120,36 @@ def manifest_dict():
     }
 
 
+@pytest.fixture
+def manifest_dict(manifest_dict_template):
+    # Tests only replace or remove top-level keys, a shallow copy is enough
+    return dict(manifest_dict_template)
+
+
+def make_manifest_dict_dumpable(manifest_dict):
+    return {
+        **manifest_dict,
+        "requested": [
+            x.url if isinstance(x, Origin) else str(x)
+            for x in manifest_dict["requested"]
+        ],
+        "swhids": [str(s) for s in manifest_dict["swhids"]],
+        "referencing": [str(s) for s in manifest_dict["referencing"]],
+    }
+
+
 @pytest.fixture
 def manifest_dict_dumpable(manifest_dict):
-    manifest_dict["requested"] = [
-        x.url if isinstance(x, Origin) else str(x) for x in manifest_dict["requested"]
-    ]
-    manifest_dict["swhids"] = [str(s) for s in manifest_dict["swhids"]]
-    manifest_dict["referencing"] = [str(s) for s in manifest_dict["referencing"]]
-    return manifest_dict
+    return make_manifest_dict_dumpable(manifest_dict)
 
 
-def test_manifest_load_success(manifest_dict_dumpable):
-    assert Manifest.load(yaml.dump(manifest_dict_dumpable))
+@pytest.fixture(scope="module")
+def manifest_yaml(manifest_dict_template):
+    return yaml.dump(make_manifest_dict_dumpable(manifest_dict_template))
+
+
+def test_manifest_load_success(manifest_yaml):
+    assert Manifest.load(manifest_yaml)
 
 
 def test_manifest_load_success_with_no_optionals(manifest_dict_dumpable):
@@ -267,6 +287,17 @@ def test_convert_8bits_to_5bits():
     ]
 
 
+@pytest.mark.parametrize("length", [1, 31, 32, 1024])
+def test_convert_bits_roundtrip(length):
+    data = list(os.urandom(length))
+    bit_string = "".join(f"{b:08b}" for b in data)
+    bit_string += "0" * (-len(bit_string) % 5)
+    expected = [int(bit_string[i : i + 5], 2) for i in range(0, len(bit_string), 5)]
+    converted = convert_bits(data, 8, 5, True)
+    assert converted == expected
+    assert convert_bits(converted, 5, 8) == data
+
+
 EXAMPLE_SECRET_SHARING_YAML = """\
 secret_sharing:
   minimum_required_groups: 2
@@ -288,7 +319,7 @@ secret_sharing:
 """
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def example_secret_sharing():
     return SecretSharing.from_dict(
         yaml.safe_load(EXAMPLE_SECRET_SHARING_YAML)["secret_sharing"]
@@ -316,12 +347,22 @@ def test_generate_encrypted_shares(example_secret_sharing):
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def secret_sharing_2_groups_required_with_1_minimum_each():
     return SecretSharing.from_dict(
-        yaml.safe_load(
-            TWO_GROUPS_REQUIRED_WITH_ONE_MINIMUM_SHARE_EACH_SECRET_SHARING_YAML
-        )["secret_sharing"]
+        two_groups_required_with_one_minimum_share_each_secret_sharing()[
+            "secret_sharing"
+        ]
+    )
+
+
+@pytest.fixture(scope="module")
+def encrypted_shares_for_object_private_key(
+    secret_sharing_2_groups_required_with_1_minimum_each,
+):
+    secret_sharing = secret_sharing_2_groups_required_with_1_minimum_each
+    return secret_sharing.generate_encrypted_shares(
+        "2-groups-with-1-minimum-each", OBJECT_SECRET_KEY
     )
 
 
@@ -351,7 +392,7 @@ secret_sharing:
 """
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def secret_sharing_2_groups_required_of_3_with_1_and_two_minimum_in_each():
     return SecretSharing.from_dict(
         yaml.safe_load(
@@ -360,6 +401,18 @@ def secret_sharing_2_groups_required_of_3_with_1_and_two_minimum_in_each():
     )
 
 
+@pytest.fixture(scope="module")
+def encrypted_shares_for_2_groups_required_of_3_with_1_and_two_minimum_in_each(
+    secret_sharing_2_groups_required_of_3_with_1_and_two_minimum_in_each,
+):
+    secret_sharing = (
+        secret_sharing_2_groups_required_of_3_with_1_and_two_minimum_in_each
+    )
+    return secret_sharing.generate_encrypted_shares(
+        "2-groups-required-of-3-with-1-and-two-minimum-in-each", OBJECT_SECRET_KEY
+    )
+
+
 def available_secret_keys_for_2_groups_required_of_3_only_ones():
     yield ("Ali", ALI_SECRET_KEY)
     yield ("Bob", BOB_SECRET_KEY)
@@ -372,30 +425,26 @@ def available_secret_keys_for_2_groups_required_of_3_one_and_two():
 
 
 @pytest.mark.parametrize(
-    "secret_sharing, available_secret_keys",
+    "encrypted_shares, available_secret_keys",
     [
         (
-            "secret_sharing_2_groups_required_with_1_minimum_each",
+            "encrypted_shares_for_object_private_key",
             available_secret_keys_for_2_groups_required_with_1_minimum_each,
         ),
         (
-            "secret_sharing_2_groups_required_of_3_with_1_and_two_minimum_in_each",
+            "encrypted_shares_for_2_groups_required_of_3_with_1_and_two_minimum_in_each",
             available_secret_keys_for_2_groups_required_of_3_only_ones,
         ),
         (
-            "secret_sharing_2_groups_required_of_3_with_1_and_two_minimum_in_each",
+            "encrypted_shares_for_2_groups_required_of_3_with_1_and_two_minimum_in_each",
             available_secret_keys_for_2_groups_required_of_3_one_and_two,
         ),
     ],
 )
 def test_object_decryption_key_recovery_roundtrip(
-    request, secret_sharing, available_secret_keys
+    request, encrypted_shares, available_secret_keys
 ):
-    secret_sharing = request.getfixturevalue(secret_sharing)
-
-    encrypted_shares = secret_sharing.generate_encrypted_shares(
-        secret_sharing, OBJECT_SECRET_KEY
-    )
+    encrypted_shares = request.getfixturevalue(encrypted_shares)
     recovered_key = recover_object_decryption_key_from_encrypted_shares(
         encrypted_shares, available_secret_keys
     )
@@ -403,15 +452,12 @@ def test_object_decryption_key_recovery_roundtrip(
 
 
 def test_object_decryption_key_recovery_with_not_enough_secret_keys(
-    secret_sharing_2_groups_required_with_1_minimum_each,
+    encrypted_shares_for_object_private_key,
 ):
     def available_secret_keys():
         yield ("Dlique", DLIQUE_SECRET_KEY)
 
-    secret_sharing = secret_sharing_2_groups_required_with_1_minimum_each
-    encrypted_shares = secret_sharing.generate_encrypted_shares(
-        "2-groups-required-with-1-minimum-each", OBJECT_SECRET_KEY
-    )
+    encrypted_shares = encrypted_shares_for_object_private_key
     with pytest.raises(SecretRecoveryError):
         _ = recover_object_decryption_key_from_encrypted_shares(
             encrypted_shares, available_secret_keys
@@ -419,16 +465,13 @@ def test_object_decryption_key_recovery_with_not_enough_secret_keys(
 
 
 def test_object_decryption_key_recovery_with_known_shares(
-    secret_sharing_2_groups_required_of_3_with_1_and_two_minimum_in_each,
+    encrypted_shares_for_2_groups_required_of_3_with_1_and_two_minimum_in_each,
 ):
     def available_secret_keys():
         yield ("Essun", ESSUN_SECRET_KEY)
 
-    secret_sharing = (
-        secret_sharing_2_groups_required_of_3_with_1_and_two_minimum_in_each
-    )
-    encrypted_shares = secret_sharing.generate_encrypted_shares(
-        "2-groups-required-of-3-with-1-and-two-minimum-in-each", OBJECT_SECRET_KEY
+    encrypted_shares = (
+        encrypted_shares_for_2_groups_required_of_3_with_1_and_two_minimum_in_each
     )
     camille_mnemonic = age_decrypt(
         CAMILLE_SECRET_KEY, encrypted_shares["Camille"]
@@ -516,14 +559,11 @@ EOF
 
 
 @pytest.fixture
-def mock_age_yubikey_plugin(tmp_path):
+def mock_age_yubikey_plugin(tmp_path, monkeypatch):
     script_path = tmp_path / "age-plugin-yubikey"
     script_path.write_text(MOCK_AGE_PLUGIN_YUBIKEY_SCRIPT)
     os.chmod(script_path, 0o500)
-    old_path = os.environ["PATH"]
-    os.environ["PATH"] = f"{tmp_path}:{os.environ['PATH']}"
-    yield
-    os.environ["PATH"] = old_path
+    monkeypatch.setenv("PATH", f"{tmp_path}:{os.environ['PATH']}")
 
 
 def test_list_yubikey_identities(mock_age_yubikey_plugin):
@@ -533,14 +573,55 @@ def test_list_yubikey_identities(mock_age_yubikey_plugin):
     ]
 
 
-@pytest.fixture
-def encrypted_shares_for_object_private_key(
-    secret_sharing_2_groups_required_with_1_minimum_each,
-):
-    secret_sharing = secret_sharing_2_groups_required_with_1_minimum_each
-    return secret_sharing.generate_encrypted_shares(
-        "2-groups-with-1-minimum-each", OBJECT_SECRET_KEY
-    )
+EXPECTED_CREATED_BUNDLE_UNIQUE_KEYS = [
+    bytes.fromhex("33e45d56f88993aae6a0198013efa80716fd8920"),
+    bytes.fromhex("c932c7649c6dfa4b82327d121215116909eb3bea"),
+    bytes.fromhex("d81cc0710eb6cf9efd5b920a8453e1e07157b6cd"),
+    bytes.fromhex("4b825dc642cb6eb9a060e54bf8d69288fbee4904"),
+    bytes.fromhex("5256e856a0a0898966d6ba14feb4388b8b82d302"),
+    bytes.fromhex("afa0105cfcaa14fdbacee344e96659170bb1bda5"),
+    bytes.fromhex("fa730cf0bb415e1e921e430984bdcddd9c8eea4a"),
+    bytes.fromhex("01a7114f36fddd5ef2511b2cadda237a68adbb12"),
+    bytes.fromhex("486e20ccedc221075b12abbb607a888875db41f6"),
+    bytes.fromhex("a646dd94c912829659b22a1e7e143d2fa5ebde1b"),
+    bytes.fromhex("db81a26783a3f4a9db07b4759ffc37621f159bb2"),
+    bytes.fromhex("f7f222093a18ec60d781070abec4a630c850b837"),
+    bytes.fromhex("9b922e6d8d5b803c1582aabe5525b7b91150788e"),
+    bytes.fromhex("db99fda25b43dc5cd90625ee4b0744751799c917"),
+    bytes.fromhex("33abd4b4c5db79c7387673f71302750fd73e0645"),
+    {
+        "date": "2015-01-01 23:00:00+00:00",
+        "origin": "https://github.com/user1/repo1",
+    },
+    {
+        "date": "2015-01-01 23:00:00+00:00",
+        "origin": "https://github.com/user1/repo1",
+        "visit": "1",
+    },
+    {
+        "date": "2017-01-01 23:00:00+00:00",
+        "origin": "https://github.com/user1/repo1",
+    },
+    {
+        "date": "2017-01-01 23:00:00+00:00",
+        "origin": "https://github.com/user1/repo1",
+        "visit": "2",
+    },
+    bytes.fromhex("9147ab9c9287940d4fdbe95d8780664d7ad2dfc0"),
+    {
+        "date": "2015-01-01 23:00:00+00:00",
+        "origin": "https://github.com/user2/repo1",
+    },
+    {
+        "date": "2015-01-01 23:00:00+00:00",
+        "origin": "https://github.com/user2/repo1",
+        "visit": "1",
+    },
+    bytes.fromhex("101d70c3574c1e4b730d7ba8e83a4bdadc8691cb"),
+    bytes.fromhex("43dad4d96edf2fb4f77f0dbf72113b8fe8b5b664"),
+    bytes.fromhex("9cafd9348f3a7729c2ef0b9b149ba421589427f0"),
+    bytes.fromhex("ef3b0865c7a05f79772a3189ddfc8515ec3e1844"),
+]
 
 
 def test_create_recovery_bundle(
@@ -607,10 +688,6 @@ def test_create_recovery_bundle(
     ) as creator:
         creator.backup_swhids(ExtendedSWHID.from_string(swhid) for swhid in swhids)
 
-    from zipfile import ZipFile
-
-    from swh.journal.serializers import kafka_to_value
-
     with ZipFile(bundle_path, "r") as bundle:
         # Do we have the expected files?
         assert bundle.namelist() == [
@@ -664,55 +741,7 @@ def test_create_recovery_bundle(
         # Have we properly saved content data?
         assert content.data == b"42\n"
         # Have we registered all saved objects?
-        assert unique_keys_found == [
-            bytes.fromhex("33e45d56f88993aae6a0198013efa80716fd8920"),
-            bytes.fromhex("c932c7649c6dfa4b82327d121215116909eb3bea"),
-            bytes.fromhex("d81cc0710eb6cf9efd5b920a8453e1e07157b6cd"),
-            bytes.fromhex("4b825dc642cb6eb9a060e54bf8d69288fbee4904"),
-            bytes.fromhex("5256e856a0a0898966d6ba14feb4388b8b82d302"),
-            bytes.fromhex("afa0105cfcaa14fdbacee344e96659170bb1bda5"),
-            bytes.fromhex("fa730cf0bb415e1e921e430984bdcddd9c8eea4a"),
-            bytes.fromhex("01a7114f36fddd5ef2511b2cadda237a68adbb12"),
-            bytes.fromhex("486e20ccedc221075b12abbb607a888875db41f6"),
-            bytes.fromhex("a646dd94c912829659b22a1e7e143d2fa5ebde1b"),
-            bytes.fromhex("db81a26783a3f4a9db07b4759ffc37621f159bb2"),
-            bytes.fromhex("f7f222093a18ec60d781070abec4a630c850b837"),
-            bytes.fromhex("9b922e6d8d5b803c1582aabe5525b7b91150788e"),
-            bytes.fromhex("db99fda25b43dc5cd90625ee4b0744751799c917"),
-            bytes.fromhex("33abd4b4c5db79c7387673f71302750fd73e0645"),
-            {
-                "date": "2015-01-01 23:00:00+00:00",
-                "origin": "https://github.com/user1/repo1",
-            },
-            {
-                "date": "2015-01-01 23:00:00+00:00",
-                "origin": "https://github.com/user1/repo1",
-                "visit": "1",
-            },
-            {
-                "date": "2017-01-01 23:00:00+00:00",
-                "origin": "https://github.com/user1/repo1",
-            },
-            {
-                "date": "2017-01-01 23:00:00+00:00",
-                "origin": "https://github.com/user1/repo1",
-                "visit": "2",
-            },
-            bytes.fromhex("9147ab9c9287940d4fdbe95d8780664d7ad2dfc0"),
-            {
-                "date": "2015-01-01 23:00:00+00:00",
-                "origin": "https://github.com/user2/repo1",
-            },
-            {
-                "date": "2015-01-01 23:00:00+00:00",
-                "origin": "https://github.com/user2/repo1",
-                "visit": "1",
-            },
-            bytes.fromhex("101d70c3574c1e4b730d7ba8e83a4bdadc8691cb"),
-            bytes.fromhex("43dad4d96edf2fb4f77f0dbf72113b8fe8b5b664"),
-            bytes.fromhex("9cafd9348f3a7729c2ef0b9b149ba421589427f0"),
-            bytes.fromhex("ef3b0865c7a05f79772a3189ddfc8515ec3e1844"),
-        ]
+        assert unique_keys_found == EXPECTED_CREATED_BUNDLE_UNIQUE_KEYS
 
 
 def test_create_recovery_bundle_fails_if_empty(
@@ -776,8 +805,6 @@ def test_create_recovery_bundle_with_optional_fields(
         creator.set_reason("we are running a test")
         creator.set_expire(expiration_date)
 
-    from zipfile import ZipFile
-
     with ZipFile(bundle_path, "r") as bundle:
         manifest = Manifest.load(bundle.read("manifest.yml"))
         assert manifest.reason == "we are running a test"
@@ -909,6 +936,14 @@ def test_recovery_bundle_decryption_key_provider_is_optional(
         _ = bundle.object_decryption_key
 
 
+def test_recovery_bundle_swhids_set(sample_recovery_bundle):
+    assert sample_recovery_bundle.swhids_set == set(sample_recovery_bundle.swhids)
+    assert (
+        ExtendedSWHID.from_string("swh:1:ori:33abd4b4c5db79c7387673f71302750fd73e0645")
+        in sample_recovery_bundle.swhids_set
+    )
+
+
 def test_recovery_bundle_requested(request, sample_recovery_bundle):
     if "version-1" in request.keywords or "version-2" in request.keywords:
         with pytest.raises(UnsupportedFeatureException):
@@ -976,7 +1011,7 @@ def test_recovery_bundle_write_content_data(tmp_path, sample_recovery_bundle):
     )
     with open(dest_path, "wb") as dest:
         sample_recovery_bundle.write_content_data(swhid, dest)
-    assert open(dest_path, "rb").read() == b"42\n"
+    assert dest_path.read_bytes() == b"42\n"
 
 
 def sorted_by_swhid(objs):
@@ -1084,6 +1119,24 @@ def test_recovery_bundle_extids(sample_recovery_bundle, sample_data):
     assert extids == [sample_data.extid1, sample_data.extid3]
 
 
+def test_recovery_bundle_objects_by_type(sample_recovery_bundle):
+    bundle = sample_recovery_bundle
+    objects_by_type = {
+        cls.object_type.value: list(objs) for cls, objs in bundle.objects_by_type()
+    }
+    assert objects_by_type["content"] == list(bundle.contents())
+    assert objects_by_type["snapshot"] == list(bundle.snapshots())
+    assert objects_by_type["extid"] == list(bundle.extids())
+    origins = list(bundle.origins())
+    assert objects_by_type["origin"] == origins
+    assert objects_by_type["origin_visit"] == [
+        visit for origin in origins for visit in bundle.origin_visits(origin)
+    ]
+    assert objects_by_type["origin_visit_status"] == [
+        status for origin in origins for status in bundle.origin_visit_statuses(origin)
+    ]
+
+
 def test_restore(sample_recovery_bundle, swh_storage, sample_data):
     expected_result = {
         "content:add": 2,
@@ -1134,8 +1187,6 @@ def test_rollover(
     sample_recovery_bundle_path,
     secret_sharing_2_groups_required_of_3_with_1_and_two_minimum_in_each,
 ):
-    import shutil
-
     bundle_path = shutil.copy(
         sample_recovery_bundle_path, tmp_path / "rollover.swh-recovery-bundle"
     )
@@ -1143,6 +1194,7 @@ def test_rollover(
         secret_sharing_2_groups_required_of_3_with_1_and_two_minimum_in_each
     )
     bundle = RecoveryBundle(bundle_path, object_decryption_key_provider_for_sample)
+    old_sorted_share_ids = bundle.sorted_share_ids
 
     # Record OriginVisit and OriginVisitStatuses objects for later comparison
     origin_visits = set()
@@ -1166,19 +1218,22 @@ def test_rollover(
     assert new_bundle.share_ids == {"Ali", "Bob", "Camille", "Dlique", "Essun"}
     # Has the old object been updated as well?
     assert bundle.share_ids == new_bundle.share_ids
+    assert bundle.sorted_share_ids != old_sorted_share_ids
+    assert bundle.sorted_share_ids == ("Ali", "Bob", "Camille", "Dlique", "Essun")
     # Is the decryption key still the same after being recovered?
     assert new_bundle.object_decryption_key == OBJECT_SECRET_KEY
     # Can we still decrypt all known objects?
-    decrypted_swhids = set()
-    for obj in itertools.chain(
-        new_bundle.contents(),
-        new_bundle.skipped_contents(),
-        new_bundle.directories(),
-        new_bundle.revisions(),
-        new_bundle.releases(),
-        new_bundle.snapshots(),
-    ):
-        decrypted_swhids.add(obj.swhid().to_extended())
+    decrypted_swhids = {
+        obj.swhid().to_extended()
+        for obj in itertools.chain(
+            new_bundle.contents(),
+            new_bundle.skipped_contents(),
+            new_bundle.directories(),
+            new_bundle.revisions(),
+            new_bundle.releases(),
+            new_bundle.snapshots(),
+        )
+    }
     new_origin_visits = set()
     new_origin_visit_statuses = set()
     for origin in new_bundle.origins():
@@ -1200,8 +1255,6 @@ def test_rollover_fails_when_unable_to_write(
     sample_recovery_bundle_path,
     secret_sharing_2_groups_required_of_3_with_1_and_two_minimum_in_each,
 ):
-    import shutil
-
     bundle_path = shutil.copy(
         sample_recovery_bundle_path, tmp_path / "rollover.swh-recovery-bundle"
     )
@@ -1215,10 +1268,13 @@ def test_rollover_fails_when_unable_to_write(
     # We can more or less simulate a full disk by preventing writes
     # in the directory holding the recovery bundle.
     os.chmod(tmp_path, 0o500)
+    try:
+        with pytest.raises(OSError):
+            bundle.rollover(secret_sharing)
+    finally:
+        os.chmod(tmp_path, 0o700)
 
-    with pytest.raises(OSError):
-        bundle.rollover(secret_sharing)
-
+    # Reopen the bundle to check that the file on disk is still intact
     new_bundle = RecoveryBundle(bundle_path, object_decryption_key_provider_for_sample)
     assert new_bundle.share_ids == share_ids
     assert new_bundle.object_decryption_key == OBJECT_SECRET_KEY